@@ -0,0 +1,127 @@
+"""
+Benchmark the Poly-AI fetch path against the offline GitHub stand-in
+
+Runs fetch_github_tools, fetch_github_tools_many and
+fetch_github_tools_graphql against a local FakeGitHub server and reports
+throughput and p50/p99 call latency without touching the network.
+
+Usage:
+    python bench_fetch.py [--iterations N] [--latency S] [--jitter S] ...
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import poly_framework
+from poly_cache import HTTPCache
+from poly_fakegithub import FakeGitHub, load_fixture, synthetic_repositories
+from poly_ratelimit import RateLimitScheduler
+
+
+def percentile(samples, pct):
+    """
+    Return the nearest-rank percentile of a list of samples.
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def run_scenario(name, call, iterations):
+    latencies = []
+    tools = 0
+    started = time.perf_counter()
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        tools += len(call())
+        latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+    return {
+        "scenario": name,
+        "iterations": iterations,
+        "calls_per_s": iterations / elapsed if elapsed else 0.0,
+        "tools_per_s": tools / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+def configure_client(server_url, limits, cache_dir):
+    """
+    Point poly_framework's shared clients at the stand-in server.
+    """
+    poly_framework.GITHUB_API = server_url
+    poly_framework._default_scheduler = RateLimitScheduler(["bench-token"], limits=limits)
+    if cache_dir:
+        poly_framework._default_cache = HTTPCache(cache_dir)
+    else:
+        os.environ["POLY_CACHE_DIR"] = ""
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline fetch-path benchmark")
+    parser.add_argument("--fixture", help="JSON list of repositories (default: synthetic)")
+    parser.add_argument("--repos", type=int, default=2000, help="Synthetic repositories")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--per-page", type=int, default=100)
+    parser.add_argument("--queries", default="automation,ci,devops,github-actions,ai")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.02, help="Base latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.01, help="Extra random latency")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--secondary-rate", type=float, default=0.0)
+    parser.add_argument("--search-limit", type=int, default=100000,
+                        help="Search requests per minute allowed by server and scheduler")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the ETag cache")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args(argv)
+
+    repos = load_fixture(args.fixture) if args.fixture else synthetic_repositories(args.repos)
+    queries = [q for q in args.queries.split(",") if q]
+    limits = {
+        "search": (args.search_limit, 60),
+        "core": (args.search_limit * 60, 3600),
+        "graphql": (args.search_limit * 60, 3600),
+    }
+
+    with FakeGitHub(repos, latency=args.latency, jitter=args.jitter,
+                    error_rate=args.error_rate, secondary_rate=args.secondary_rate,
+                    limits=limits) as fake, tempfile.TemporaryDirectory() as tmp:
+        configure_client(fake.url, limits, None if args.no_cache else tmp)
+        results = [
+            run_scenario("fetch_github_tools",
+                         lambda: poly_framework.fetch_github_tools(queries[0], args.per_page),
+                         args.iterations),
+            run_scenario("fetch_github_tools_many",
+                         lambda: poly_framework.fetch_github_tools_many(
+                             queries, args.per_page, args.concurrency),
+                         args.iterations),
+            run_scenario("fetch_github_tools_graphql",
+                         lambda: poly_framework.fetch_github_tools_graphql(
+                             queries[0], args.per_page),
+                         args.iterations),
+        ]
+        server_requests = dict(fake.counts)
+        cache = poly_framework._default_cache
+        cache_stats = cache.stats() if cache is not None else None
+
+    print(f"{'scenario':<28} {'calls/s':>9} {'tools/s':>10} {'p50 ms':>9} {'p99 ms':>9}")
+    for r in results:
+        print(f"{r['scenario']:<28} {r['calls_per_s']:>9.1f} {r['tools_per_s']:>10.1f} "
+              f"{r['p50_ms']:>9.1f} {r['p99_ms']:>9.1f}")
+    print(f"Server requests: {server_requests}")
+    if cache_stats:
+        print(f"HTTP cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"results": results, "server_requests": server_requests,
+                       "cache": cache_stats}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
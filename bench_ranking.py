@@ -0,0 +1,184 @@
+"""
+Benchmark suite for the Poly-AI ranking engine
+
+Generates synthetic catalogues across row counts, metric widths and weight
+profile counts, times rank_tools (full sort, top-k and batched profiles)
+and records peak traced memory. Results can be saved as a JSON baseline;
+later runs are compared against it and regressions beyond a threshold
+make the suite exit non-zero.
+
+Usage:
+    python bench_ranking.py [--rows 1e2,1e4,1e6] [--save-baseline]
+    python bench_ranking.py --baseline bench_ranking_baseline.json --threshold 0.2
+"""
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from poly_framework import rank_tools
+from poly_ranking import ToolCatalog
+
+DEFAULT_BASELINE = "bench_ranking_baseline.json"
+
+
+def synthetic_catalog(rows, width, seed=0):
+    """
+    Build a ToolCatalog of random heavy-tailed metrics.
+
+    Args:
+        rows (int): Number of tools
+        width (int): Number of metrics per tool
+        seed (int): Random seed
+
+    Returns:
+        ToolCatalog: Synthetic catalogue
+    """
+    rng = np.random.default_rng(seed)
+    names = np.full(rows, "bench/tool", dtype=object)
+    return ToolCatalog(np.arange(rows), names, names, rng.pareto(1.5, size=(rows, width)))
+
+
+def cases(row_counts, widths, profile_counts, k, full_sort_max, max_bytes):
+    """
+    Yield (name, call) pairs for every benchmark case.
+    """
+    for rows in row_counts:
+        for width in widths:
+            if rows * width * 8 > max_bytes:
+                continue
+            catalog = None
+            rng = np.random.default_rng(rows + width)
+
+            def get_catalog(rows=rows, width=width):
+                nonlocal catalog
+                if catalog is None:
+                    catalog = synthetic_catalog(rows, width)
+                return catalog
+
+            weights = rng.random(width)
+            if rows <= full_sort_max:
+                yield (f"full_sort/rows={rows}/width={width}/profiles=1",
+                       lambda c=get_catalog, w=weights: rank_tools(c(), w))
+            yield (f"top_k/rows={rows}/width={width}/profiles=1",
+                   lambda c=get_catalog, w=weights: rank_tools(c(), w, k=k))
+            for profiles in profile_counts:
+                matrix = rng.random((profiles, width))
+                yield (f"batched/rows={rows}/width={width}/profiles={profiles}",
+                       lambda c=get_catalog, w=matrix: rank_tools(c(), w, k=k))
+
+
+def measure(call, repeat):
+    """
+    Time a call (best of repeat) and record its peak traced memory.
+
+    Returns:
+        dict: seconds and peak_bytes
+    """
+    call()  # warm-up, also builds the catalogue outside the timed region
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        call()
+        best = min(best, time.perf_counter() - t0)
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        call()
+        peak = tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+    return {"seconds": best, "peak_bytes": peak}
+
+
+def compare(results, baseline, threshold, min_seconds=0.0):
+    """
+    Compare results with a baseline.
+
+    Timings where both runs are below min_seconds are ignored, since
+    sub-millisecond cases are dominated by noise.
+
+    Returns:
+        list: (case, metric, baseline value, current value) regressions
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        for metric in ("seconds", "peak_bytes"):
+            if metric == "seconds" and max(previous[metric], current[metric]) < min_seconds:
+                continue
+            if previous[metric] and current[metric] > previous[metric] * (1 + threshold):
+                regressions.append((name, metric, previous[metric], current[metric]))
+    return regressions
+
+
+def _counts(value):
+    return [int(float(v)) for v in value.split(",") if v]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ranking engine benchmark suite")
+    parser.add_argument("--rows", default="1e2,1e3,1e4,1e5,1e6,1e7",
+                        help="Comma-separated catalogue sizes")
+    parser.add_argument("--widths", default="4,16,64", help="Comma-separated metric widths")
+    parser.add_argument("--profiles", default="4,16",
+                        help="Comma-separated weight profile counts for batched ranking")
+    parser.add_argument("-k", type=int, default=50, help="Top-k size")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case (best kept)")
+    parser.add_argument("--full-sort-max", type=float, default=1e6,
+                        help="Largest catalogue to run the full Python sort on")
+    parser.add_argument("--max-bytes", type=float, default=1 << 30,
+                        help="Skip catalogues whose metric matrix exceeds this size")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Write the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Allowed slowdown or memory growth before flagging (0.2 = 20%%)")
+    parser.add_argument("--min-time", type=float, default=0.001,
+                        help="Ignore timing changes of cases faster than this many seconds")
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args(argv)
+
+    results = {}
+    print(f"{'case':<44} {'ms':>10} {'peak MiB':>10}")
+    for name, call in cases(_counts(args.rows), _counts(args.widths), _counts(args.profiles),
+                            args.k, args.full_sort_max, args.max_bytes):
+        results[name] = measure(call, args.repeat)
+        print(f"{name:<44} {results[name]['seconds'] * 1000:>10.2f} "
+              f"{results[name]['peak_bytes'] / (1 << 20):>10.2f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    try:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold, args.min_time)
+    for name, metric, before, after in regressions:
+        print(f"REGRESSION {name} {metric}: {before:.6g} -> {after:.6g} "
+              f"(+{(after / before - 1) * 100:.0f}%)")
+    if regressions:
+        return 1
+    print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
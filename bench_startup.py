@@ -0,0 +1,101 @@
+"""
+Startup benchmark for the Poly-AI framework
+
+Times cold interpreter starts that import poly_framework and pick a
+workflow (the common cron/shell path), and breaks the import down with
+`python -X importtime` so regressions in startup cost can be traced to the
+module that introduced them.
+
+Usage:
+    python bench_startup.py [--runs N] [--top N] [--budget-ms MS] [--json FILE]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SNIPPET = "import poly_framework; poly_framework.pick_workflow_type({})"
+
+
+def time_startup(runs, cwd):
+    """
+    Time cold interpreter starts running SNIPPET.
+
+    Args:
+        runs (int): Number of interpreter starts
+        cwd (str): Directory containing poly_framework.py
+
+    Returns:
+        list: Wall-clock seconds per start
+    """
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, "-c", SNIPPET], cwd=cwd, check=True)
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+
+def import_profile(cwd):
+    """
+    Run SNIPPET under -X importtime and parse the per-module timings.
+
+    Args:
+        cwd (str): Directory containing poly_framework.py
+
+    Returns:
+        list: (module, self microseconds, cumulative microseconds) tuples
+    """
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", SNIPPET], cwd=cwd,
+                          check=True, capture_output=True, text=True)
+    modules = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # column header
+        modules.append((fields[2].strip(), int(fields[0]), int(fields[1])))
+    return modules
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Poly-AI startup benchmark")
+    parser.add_argument("--runs", type=int, default=10, help="Cold starts to time")
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports to list")
+    parser.add_argument("--budget-ms", type=float,
+                        help="Exit non-zero if the median start exceeds this many milliseconds")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args(argv)
+
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    samples = [s * 1000 for s in time_startup(args.runs, cwd)]
+    modules = import_profile(cwd)
+    poly_import = next((cum for name, _, cum in modules if name == "poly_framework"), 0)
+
+    median = statistics.median(samples) if samples else 0.0
+    print(f"Interpreter start + workflow pick: median {median:.1f} ms, "
+          f"min {min(samples, default=0):.1f} ms over {len(samples)} runs")
+    print(f"import poly_framework: {poly_import / 1000:.1f} ms cumulative")
+    print(f"{'module':<40} {'self ms':>9} {'cumulative ms':>14}")
+    for name, self_us, cum_us in sorted(modules, key=lambda m: m[2], reverse=True)[:args.top]:
+        print(f"{name:<40} {self_us / 1000:>9.2f} {cum_us / 1000:>14.2f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"startup_ms": samples, "median_ms": median,
+                       "poly_framework_import_ms": poly_import / 1000,
+                       "imports": [{"module": n, "self_us": s, "cumulative_us": c}
+                                   for n, s, c in modules]}, f, indent=2)
+
+    if args.budget_ms is not None and median > args.budget_ms:
+        print(f"Startup {median:.1f} ms exceeds budget of {args.budget_ms:.1f} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
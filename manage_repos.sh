@@ -39,6 +39,13 @@ list_repos() {
 check_status() {
     echo "=== Repository Status ==="
     
+    # Scan every listed repository concurrently, reusing cached results for
+    # repositories whose index and HEAD have not changed in the last 10s
+    if [ -f "$REPO_LIST_FILE" ]; then
+        python3 "$PROJECTS_DIR/poly_sync.py" "$REPO_LIST_FILE" --status --max-age 10
+        return
+    fi
+    
     # Check sentiment-analysis-bert
     if [ -d "$PROJECTS_DIR/sentiment-analysis-project" ]; then
         cd "$PROJECTS_DIR/sentiment-analysis-project"
@@ -0,0 +1,161 @@
+"""
+GitHub API budget accounting and enforcement for the Poly-AI Framework
+"""
+import threading
+
+
+class BudgetExceeded(RuntimeError):
+    """Raised when a request would exceed the run's API budget."""
+
+
+def _usage():
+    return {
+        "rest_calls": 0,
+        "graphql_calls": 0,
+        "graphql_cost": 0,
+        "points": 0,
+        "bytes": 0,
+        "cache_hits": 0,
+        "bytes_saved": 0,
+        "stale_served": 0,
+        "denied": 0,
+    }
+
+
+class APIBudget:
+    """
+    Per-run and per-query accounting of GitHub API spend.
+
+    Spend is measured in rate-limit points: one per REST request that
+    reaches GitHub's primary limit (a 304 revalidation is free) plus the
+    rateLimit.cost GitHub reports for each GraphQL query. Bytes received,
+    cache hits and the bytes those hits saved are tracked alongside.
+
+    With a limit set, callers reserve a point with try_spend() before each
+    request and serve cached data instead of calling GitHub once it is
+    refused. The check and the reservation are one atomic step, so
+    concurrent pages cannot all pass the check before any is charged; a
+    304 replay refunds its point and a GraphQL query settles its reported
+    cost afterwards, so only GraphQL costs above one point can overshoot.
+    """
+
+    def __init__(self, limit=None, per_query=None):
+        """
+        Args:
+            limit (int): Points a run may spend, or None for no limit
+            per_query (int): Points each query may spend, or None
+        """
+        self.limit = limit
+        self.per_query = per_query
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """
+        Start a new run, clearing all spend.
+        """
+        with self._lock:
+            self._run = _usage()
+            self._queries = {}
+
+    def _scopes(self, query):
+        scopes = [self._run]
+        if query is not None:
+            scopes.append(self._queries.setdefault(query, _usage()))
+        return scopes
+
+    def _exhausted(self, query):
+        if self.limit is not None and self._run["points"] >= self.limit:
+            return True
+        if query is not None and self.per_query is not None:
+            return self._queries.get(query, {}).get("points", 0) >= self.per_query
+        return False
+
+    def exhausted(self, query=None):
+        """
+        Return True if the run, or the given query, has used its budget.
+        """
+        with self._lock:
+            return self._exhausted(query)
+
+    def try_spend(self, query=None):
+        """
+        Reserve the point for one request unless the budget is spent.
+
+        Args:
+            query (str): Discovery query the request belongs to
+
+        Returns:
+            bool: True if the point was reserved and the request may be sent
+        """
+        with self._lock:
+            if self._exhausted(query):
+                return False
+            for usage in self._scopes(query):
+                usage["points"] += 1
+            return True
+
+    def record(self, api, response, query=None):
+        """
+        Account for the response to a request reserved with try_spend().
+
+        Args:
+            api (str): "rest" or "graphql"
+            response (requests.Response): Response, with ``from_cache`` set
+                when the HTTP cache replayed it after a 304, which refunds
+                the reserved point
+            query (str): Discovery query the call belongs to
+        """
+        from_cache = getattr(response, "from_cache", False)
+        size = len(response.content)
+        with self._lock:
+            for usage in self._scopes(query):
+                usage[f"{api}_calls"] += 1
+                if from_cache:
+                    usage["cache_hits"] += 1
+                    usage["bytes_saved"] += size
+                    usage["points"] -= 1
+                else:
+                    usage["bytes"] += size
+
+    def charge(self, cost, query=None):
+        """
+        Settle the rateLimit.cost GitHub reported for a GraphQL query
+        against the point try_spend() reserved for it.
+        """
+        with self._lock:
+            for usage in self._scopes(query):
+                usage["graphql_cost"] += cost
+                usage["points"] += cost - 1
+
+    def record_stale(self, response, query=None):
+        """
+        Account for a cached response served without revalidation.
+        """
+        with self._lock:
+            for usage in self._scopes(query):
+                usage["stale_served"] += 1
+                usage["bytes_saved"] += len(response.content)
+
+    def record_denied(self, query=None):
+        """
+        Account for a request refused because the budget was exhausted.
+        """
+        with self._lock:
+            for usage in self._scopes(query):
+                usage["denied"] += 1
+
+    def report(self):
+        """
+        Return the run's spend, overall and per query.
+
+        Returns:
+            dict: Limits, run totals and per-query totals
+        """
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "per_query": self.per_query,
+                "run": dict(self._run),
+                "queries": {query: dict(usage) for query, usage in self._queries.items()},
+            }
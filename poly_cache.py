@@ -0,0 +1,419 @@
+"""
+Caching helpers for the Poly-AI Framework
+"""
+import fcntl
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+
+class HTTPCache:
+    """
+    Persistent on-disk cache for conditional HTTP GET requests.
+
+    Responses are stored together with their ETag and Last-Modified
+    validators. Later requests for the same URL send If-None-Match and
+    If-Modified-Since; a 304 answer replays the stored body. The cache is
+    bounded by total body size and evicts least recently used entries.
+
+    Several processes (the daemon, cron runs, benchmarks) may share one
+    directory: each save merges this process's changes into the index on
+    disk under a file lock, and eviction runs on the merged index.
+    """
+
+    INDEX_FILE = "index.json"
+    LOCK_FILE = "index.lock"
+
+    # Bodies in no index older than this are left over from a crash
+    ORPHAN_AGE = 3600
+
+    def __init__(self, directory, max_bytes=50 * 1024 * 1024):
+        """
+        Open (or create) a cache directory.
+
+        Args:
+            directory (str): Directory holding cached bodies and the index
+            max_bytes (int): Maximum total size of cached bodies
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.stores = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        # Keys this process stored or used, and keys it evicted (with the
+        # time), since its last save
+        self._dirty = set()
+        self._removed = {}
+        os.makedirs(directory, exist_ok=True)
+        with self._file_lock():
+            self._index = self._load_index()
+            self._remove_orphans()
+
+    @contextmanager
+    def _file_lock(self):
+        with open(os.path.join(self.directory, self.LOCK_FILE), "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _load_index(self):
+        path = os.path.join(self.directory, self.INDEX_FILE)
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _remove_orphans(self):
+        cutoff = time.time() - self.ORPHAN_AGE
+        for name in os.listdir(self.directory):
+            if not name.endswith(".body") or name[:-len(".body")] in self._index:
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                if os.stat(path).st_mtime < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
+
+    def _save_index(self):
+        # Merge into the index on disk rather than overwrite it, so entries
+        # other processes stored or evicted since our last save survive
+        path = os.path.join(self.directory, self.INDEX_FILE)
+        with self._file_lock():
+            merged = self._load_index()
+            for key in self._dirty:
+                entry = self._index.get(key)
+                theirs = merged.get(key)
+                if entry is not None and (theirs is None or entry["atime"] >= theirs["atime"]):
+                    merged[key] = entry
+            for key, removed_at in self._removed.items():
+                if key in merged and merged[key]["atime"] <= removed_at:
+                    del merged[key]
+            self._index = merged
+            self._evict()
+            self._dirty.clear()
+            self._removed.clear()
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._index, f)
+            os.replace(tmp, path)
+
+    def _body_path(self, key):
+        return os.path.join(self.directory, key + ".body")
+
+    @staticmethod
+    def _key(url):
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _read_body(self, key):
+        try:
+            with open(self._body_path(key), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _store(self, key, url, response):
+        entry = {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "size": len(response.content),
+            "atime": time.time(),
+        }
+        if not entry["etag"] and not entry["last_modified"]:
+            return
+        with open(self._body_path(key), "wb") as f:
+            f.write(response.content)
+        self._index[key] = entry
+        self._dirty.add(key)
+        self.stores += 1
+        self._save_index()
+
+    def _evict(self):
+        total = sum(e["size"] for e in self._index.values())
+        for key in sorted(self._index, key=lambda k: self._index[k]["atime"]):
+            if total <= self.max_bytes:
+                break
+            total -= self._index.pop(key)["size"]
+            self._removed[key] = time.time()
+            try:
+                os.remove(self._body_path(key))
+            except OSError:
+                pass
+            self.evictions += 1
+
+    def get(self, url, params=None, headers=None, session=None, **kwargs):
+        """
+        Perform a conditional GET, replaying the cached body on 304.
+
+        Args:
+            url (str): Request URL
+            params (dict): Query parameters
+            headers (dict): Extra request headers
+            session: Object with a requests-compatible get(), defaults to requests
+            **kwargs: Passed through to get()
+
+        Returns:
+            requests.Response: Response whose body is the fresh or cached
+            payload; ``from_cache`` is True when the body was replayed
+        """
+        # Imported here so that loading the cache module stays cheap
+        import requests
+
+        full_url = requests.Request("GET", url, params=params).prepare().url
+        key = self._key(full_url)
+        headers = dict(headers or {})
+
+        with self._lock:
+            entry = self._index.get(key)
+            body = self._read_body(key) if entry else None
+        if body is not None:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = (session or requests).get(full_url, headers=headers, **kwargs)
+        response.from_cache = False
+
+        with self._lock:
+            if response.status_code == 304 and body is not None:
+                self.hits += 1
+                # A save on another thread may have replaced the index since
+                entry = self._index.setdefault(key, entry)
+                entry["atime"] = time.time()
+                self._dirty.add(key)
+                response.status_code = 200
+                response._content = body
+                response.from_cache = True
+                self._save_index()
+            else:
+                self.misses += 1
+                if response.status_code == 200:
+                    self._store(key, full_url, response)
+        return response
+
+    def peek(self, url, params=None):
+        """
+        Return the cached body for a URL without contacting the server.
+
+        Used when revalidating is not allowed, e.g. once the API budget
+        is spent; the body may be stale.
+
+        Args:
+            url (str): Request URL
+            params (dict): Query parameters
+
+        Returns:
+            requests.Response: Replayed response with ``from_cache`` and
+            ``stale`` set, or None if nothing is cached
+        """
+        import requests
+
+        full_url = requests.Request("GET", url, params=params).prepare().url
+        key = self._key(full_url)
+        with self._lock:
+            entry = self._index.get(key)
+            body = self._read_body(key) if entry else None
+            if body is None:
+                return None
+            self.stale_hits += 1
+            entry["atime"] = time.time()
+            self._dirty.add(key)
+            self._save_index()
+        response = requests.Response()
+        response.status_code = 200
+        response.url = full_url
+        response._content = body
+        response.from_cache = True
+        response.stale = True
+        return response
+
+    def stats(self):
+        """
+        Return cache counters.
+
+        Returns:
+            dict: Hit, stale hit, miss, store and eviction counts plus current size
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale_hits": self.stale_hits,
+                "stores": self.stores,
+                "evictions": self.evictions,
+                "entries": len(self._index),
+                "bytes": sum(e["size"] for e in self._index.values()),
+            }
+
+
+class TTLCache:
+    """
+    Time-to-live cache held in memory and optionally mirrored on disk.
+
+    Entries expire ttl seconds after they are stored. The in-memory layer
+    is bounded and evicts least recently used entries; the optional disk
+    layer lets cached values survive across runs. Expired files are
+    deleted, and the disk layer keeps at most max_entries files.
+    """
+
+    def __init__(self, ttl=3600, max_entries=1024, directory=None):
+        """
+        Args:
+            ttl (float): Seconds an entry stays valid
+            max_entries (int): Maximum entries kept in memory and on disk
+            directory (str): Directory for the disk layer, or None
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, HTTPCache._key(key) + ".json")
+
+    def _load(self, key):
+        if not self.directory:
+            return None
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                entry = json.load(f)
+            return entry["expires"], entry["value"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _discard(self, key):
+        if not self.directory:
+            return
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _prune(self, now):
+        # Drop files past their ttl, then the oldest beyond max_entries;
+        # a file's mtime is when its entry was stored
+        files = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                files.append((os.stat(path).st_mtime, path))
+            except OSError:
+                continue
+        files.sort(reverse=True)
+        for index, (stored, path) in enumerate(files):
+            if index >= self.max_entries or stored + self.ttl <= now:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def get(self, key, default=None):
+        """
+        Return the cached value for key, or default if absent or expired.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._load(key)
+                if entry is not None:
+                    self._entries[key] = entry
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                self._discard(key)
+            self._entries.pop(key, None)
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        """
+        Store value under key for ttl seconds.
+        """
+        now = time.time()
+        expires = now + self.ttl
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            if self.directory:
+                path = self._path(key)
+                tmp = f"{path}.{os.getpid()}.tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump({"key": key, "expires": expires, "value": value}, f)
+                os.replace(tmp, path)
+                self._prune(now)
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into one execution.
+
+    The first caller for a key runs the function; callers arriving while it
+    is in flight wait and share its result (or its exception).
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    def do(self, key, fn):
+        """
+        Run fn() for key unless a call for key is already in flight.
+
+        Args:
+            key: Hashable call key
+            fn (callable): Zero-argument function producing the result
+
+        Returns:
+            The result of the shared call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = {"done": threading.Event()}
+            else:
+                self.coalesced += 1
+        if not leader:
+            call["done"].wait()
+            if "error" in call:
+                raise call["error"]
+            return call["result"]
+        try:
+            call["result"] = fn()
+            return call["result"]
+        except BaseException as e:
+            call["error"] = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call["done"].set()
@@ -0,0 +1,436 @@
+"""
+Long-running scheduler and control socket for the Poly-AI Framework
+"""
+import json
+import os
+import re
+import signal
+import socket
+import socketserver
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta
+
+# Not under $XDG_RUNTIME_DIR: cron does not set it, so a daemon started from
+# cron and ctl run from a login shell would look in different places
+DEFAULT_SOCKET = os.getenv("POLY_DAEMON_SOCKET") or os.path.join(
+    os.path.expanduser("~"), ".cache", "poly_framework", "daemon.sock")
+
+_INTERVAL = re.compile(r"^(\d+(?:\.\d+)?)\s*([smhd]?)$")
+_UNITS = {"": 1, "s": 1, "m": 60, "h": 3600, "d": 86400}
+
+CRON_ALIASES = {
+    "@hourly": "0 * * * *",
+    "@daily": "0 0 * * *",
+    "@weekly": "0 0 * * 0",
+    "@monthly": "0 0 1 * *",
+    "@yearly": "0 0 1 1 *",
+}
+
+
+class IntervalSchedule:
+    """
+    Schedule firing a fixed number of seconds after the previous run.
+    """
+
+    def __init__(self, seconds):
+        """
+        Args:
+            seconds (float): Interval between runs
+        """
+        if seconds <= 0:
+            raise ValueError("Interval must be positive")
+        self.seconds = seconds
+
+    def next_after(self, moment):
+        """
+        Return the first run time after moment (a UNIX timestamp).
+        """
+        return moment + self.seconds
+
+    def __repr__(self):
+        return f"IntervalSchedule({self.seconds:g}s)"
+
+
+def _cron_field(text, low, high):
+    values = set()
+    for part in text.split(","):
+        body, _, step = part.partition("/")
+        step = int(step) if step else 1
+        if body == "*":
+            start, end = low, high
+        elif "-" in body:
+            start, end = (int(v) for v in body.split("-", 1))
+        else:
+            start = int(body)
+            end = high if step > 1 else start
+        if start < low or end > high or start > end or step < 1:
+            raise ValueError(f"Cron field {text!r} is outside {low}-{high}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronSchedule:
+    """
+    Schedule driven by a five-field cron expression in local time.
+
+    Supports `*`, lists, ranges and steps in the minute, hour, day of month,
+    month and day of week fields (0 or 7 is Sunday), plus the @hourly,
+    @daily, @weekly, @monthly and @yearly aliases. As in cron, when both day
+    fields are restricted a day matching either of them fires.
+    """
+
+    def __init__(self, expression):
+        """
+        Args:
+            expression (str): Cron expression, e.g. "0 10 * * 0"
+
+        Raises:
+            ValueError: If the expression is malformed
+        """
+        self.expression = expression
+        fields = CRON_ALIASES.get(expression, expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression {expression!r} needs five fields")
+        self.minutes = _cron_field(fields[0], 0, 59)
+        self.hours = _cron_field(fields[1], 0, 23)
+        self.days = _cron_field(fields[2], 1, 31)
+        self.months = _cron_field(fields[3], 1, 12)
+        self.weekdays = {d % 7 for d in _cron_field(fields[4], 0, 7)}
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    def _day_matches(self, moment):
+        day = moment.day in self.days
+        # datetime counts Monday as 0, cron counts Sunday as 0
+        weekday = (moment.weekday() + 1) % 7 in self.weekdays
+        if self._any_day or self._any_weekday:
+            return day and weekday
+        return day or weekday
+
+    def next_after(self, moment):
+        """
+        Return the first matching minute after moment (a UNIX timestamp).
+
+        Raises:
+            ValueError: If the expression never matches (e.g. 30 February)
+        """
+        t = datetime.fromtimestamp(moment).replace(second=0, microsecond=0) + timedelta(minutes=1)
+        # Four years plus a day covers every combination including 29 February
+        limit = t + timedelta(days=4 * 366)
+        while t < limit:
+            if t.month not in self.months:
+                year, month = (t.year + 1, 1) if t.month == 12 else (t.year, t.month + 1)
+                t = t.replace(year=year, month=month, day=1, hour=0, minute=0)
+            elif not self._day_matches(t):
+                t = t.replace(hour=0, minute=0) + timedelta(days=1)
+            elif t.hour not in self.hours:
+                t = t.replace(minute=0) + timedelta(hours=1)
+            elif t.minute not in self.minutes:
+                t += timedelta(minutes=1)
+            else:
+                return t.timestamp()
+        raise ValueError(f"Cron expression {self.expression!r} never fires")
+
+    def __repr__(self):
+        return f"CronSchedule({self.expression!r})"
+
+
+def parse_schedule(spec):
+    """
+    Parse an interval ("90", "30s", "15m", "6h", "1d") or a cron expression.
+
+    Args:
+        spec (str): Schedule specification
+
+    Returns:
+        IntervalSchedule or CronSchedule: Parsed schedule
+
+    Raises:
+        ValueError: If spec is neither a valid interval nor cron expression
+    """
+    spec = spec.strip()
+    match = _INTERVAL.match(spec)
+    if match:
+        return IntervalSchedule(float(match.group(1)) * _UNITS[match.group(2)])
+    return CronSchedule(spec)
+
+
+class Job:
+    """
+    A named callable run by the daemon on a schedule or on demand.
+    """
+
+    def __init__(self, name, fn, schedule=None, run_at_start=False):
+        """
+        Args:
+            name (str): Job name used on the control socket
+            fn (callable): Called with no arguments; its return value must
+                be JSON-serialisable and is reported as the last result
+            schedule (IntervalSchedule or CronSchedule): When to run, or
+                None for jobs that only run when triggered
+            run_at_start (bool): Run once as soon as the daemon starts
+        """
+        self.name = name
+        self.fn = fn
+        self.schedule = schedule
+        self.run_at_start = run_at_start
+        self.next_run = None
+        self.triggered = False
+        self.running = False
+        self.runs = 0
+        self.failures = 0
+        self.last_started = None
+        self.last_duration = None
+        self.last_result = None
+        self.last_error = None
+
+    def status(self):
+        def iso(moment):
+            return datetime.fromtimestamp(moment).isoformat(timespec="seconds") if moment else None
+
+        return {
+            "schedule": repr(self.schedule) if self.schedule else None,
+            "next_run": iso(self.next_run),
+            "running": self.running,
+            "runs": self.runs,
+            "failures": self.failures,
+            "last_started": iso(self.last_started),
+            "last_duration": self.last_duration,
+            "last_result": self.last_result,
+            "last_error": self.last_error,
+        }
+
+
+class _ControlHandler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        line = self.rfile.readline()
+        try:
+            request = json.loads(line)
+            result = self.server.poly_daemon.handle_command(request)
+            response = {"ok": True, "result": result}
+        except Exception as e:
+            response = {"ok": False, "error": str(e)}
+        self.wfile.write(json.dumps(response, default=str).encode() + b"\n")
+
+
+class _ControlServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+class Daemon:
+    """
+    In-process scheduler that keeps clients, caches and indexes warm.
+
+    Jobs run one at a time on the scheduler thread, so state shared between
+    them (HTTP pools, caches, ranking indexes) needs no extra locking. A
+    Unix control socket accepts one JSON request per connection, e.g.
+    {"command": "run", "job": "refresh"}, and answers with one JSON line.
+    The built-in commands are status, run and stop; more can be added with
+    add_command.
+    """
+
+    def __init__(self, socket_path=None, status_extra=None):
+        """
+        Args:
+            socket_path (str): Control socket path, or None for no socket
+            status_extra (callable): Returns a dict merged into status
+        """
+        self.socket_path = socket_path
+        self.status_extra = status_extra
+        self.jobs = {}
+        self.started = None
+        self._commands = {"status": self._status_command, "run": self._run_command,
+                          "stop": self._stop_command}
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        self._server = None
+
+    def add_job(self, name, fn, schedule=None, run_at_start=False):
+        """
+        Register a job.
+
+        Returns:
+            Job: The registered job
+        """
+        job = Job(name, fn, schedule, run_at_start)
+        self.jobs[name] = job
+        return job
+
+    def add_command(self, name, fn):
+        """
+        Register a control command; fn receives the request dict.
+        """
+        self._commands[name] = fn
+
+    def trigger(self, name):
+        """
+        Queue a job to run as soon as the scheduler is free.
+
+        Raises:
+            ValueError: If no job has that name
+        """
+        if name not in self.jobs:
+            raise ValueError(f"Unknown job {name!r}")
+        with self._lock:
+            self.jobs[name].triggered = True
+        self._wake.set()
+
+    def status(self):
+        """
+        Return the daemon's and every job's status.
+
+        Returns:
+            dict: Uptime, per-job status and any extra status
+        """
+        with self._lock:
+            jobs = {name: job.status() for name, job in self.jobs.items()}
+        status = {
+            "pid": os.getpid(),
+            "uptime": time.time() - self.started if self.started else 0.0,
+            "jobs": jobs,
+        }
+        if self.status_extra is not None:
+            status.update(self.status_extra())
+        return status
+
+    def handle_command(self, request):
+        """
+        Dispatch one control request.
+
+        Raises:
+            ValueError: If the command is unknown
+        """
+        command = self._commands.get(request.get("command"))
+        if command is None:
+            raise ValueError(f"Unknown command {request.get('command')!r}; "
+                             f"expected one of {sorted(self._commands)}")
+        return command(request)
+
+    def _status_command(self, request):
+        return self.status()
+
+    def _run_command(self, request):
+        self.trigger(request.get("job"))
+        return {"queued": request.get("job")}
+
+    def _stop_command(self, request):
+        self.stop()
+        return {"stopping": True}
+
+    def stop(self):
+        self._stopping.set()
+        self._wake.set()
+
+    def _run_job(self, job):
+        with self._lock:
+            job.running = True
+            job.triggered = False
+            job.last_started = time.time()
+        started = time.monotonic()
+        result = error = None
+        try:
+            result = job.fn()
+        except Exception:
+            error = traceback.format_exc(limit=3)
+        with self._lock:
+            job.running = False
+            job.runs += 1
+            job.last_duration = time.monotonic() - started
+            job.last_result = result
+            job.last_error = error
+            if error:
+                job.failures += 1
+            if job.schedule is not None:
+                job.next_run = job.schedule.next_after(time.time())
+
+    def _due(self, now):
+        with self._lock:
+            for job in self.jobs.values():
+                if job.triggered or (job.next_run is not None and job.next_run <= now):
+                    return job
+        return None
+
+    def _start_control_server(self):
+        os.makedirs(os.path.dirname(self.socket_path) or ".", exist_ok=True)
+        if os.path.exists(self.socket_path):
+            try:
+                send_command(self.socket_path, "status", timeout=1)
+            except OSError:
+                os.unlink(self.socket_path)  # left behind by a dead daemon
+            else:
+                raise RuntimeError(f"A daemon is already listening on {self.socket_path}")
+        old_umask = os.umask(0o177)
+        try:
+            self._server = _ControlServer(self.socket_path, _ControlHandler)
+        finally:
+            os.umask(old_umask)
+        self._server.poly_daemon = self
+        threading.Thread(target=self._server.serve_forever, name="poly-control",
+                         daemon=True).start()
+
+    def serve_forever(self):
+        """
+        Run scheduled and triggered jobs until stop() or SIGTERM/SIGINT.
+        """
+        self.started = time.time()
+        now = time.time()
+        for job in self.jobs.values():
+            if job.run_at_start:
+                job.triggered = True
+            if job.schedule is not None:
+                job.next_run = job.schedule.next_after(now)
+        if threading.current_thread() is threading.main_thread():
+            for signum in (signal.SIGTERM, signal.SIGINT):
+                signal.signal(signum, lambda *_: self.stop())
+        if self.socket_path:
+            self._start_control_server()
+        try:
+            while not self._stopping.is_set():
+                job = self._due(time.time())
+                if job is not None:
+                    self._run_job(job)
+                    continue
+                with self._lock:
+                    upcoming = [j.next_run for j in self.jobs.values() if j.next_run is not None]
+                timeout = max(0.0, min(upcoming) - time.time()) if upcoming else 60.0
+                # Wake at least once a minute so wall-clock jumps are noticed
+                self._wake.wait(min(timeout, 60.0))
+                self._wake.clear()
+        finally:
+            if self._server is not None:
+                self._server.shutdown()
+                self._server.server_close()
+                if os.path.exists(self.socket_path):
+                    os.unlink(self.socket_path)
+
+
+def send_command(socket_path, command, timeout=10.0, **args):
+    """
+    Send one request to a running daemon's control socket.
+
+    Args:
+        socket_path (str): Control socket path
+        command (str): Command name, e.g. "status", "run" or "stop"
+        timeout (float): Socket timeout in seconds
+        **args: Extra request fields, e.g. job="refresh"
+
+    Returns:
+        The command's result
+
+    Raises:
+        OSError: If the daemon cannot be reached
+        RuntimeError: If the daemon rejects the request
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path)
+        sock.sendall(json.dumps(dict(args, command=command)).encode() + b"\n")
+        with sock.makefile("rb") as reader:
+            response = json.loads(reader.readline())
+    if not response["ok"]:
+        raise RuntimeError(response["error"])
+    return response["result"]
@@ -0,0 +1,389 @@
+"""
+Offline GitHub API stand-in for the Poly-AI Framework
+
+Replays repository fixtures through the search, repository and GraphQL
+endpoints used by the fetch path, with configurable latency, jitter,
+rate-limit headers and error injection. Fixtures are JSON lists of REST
+repository objects, either recorded from the live API with ``record`` or
+generated with synthetic_repositories().
+
+Usage:
+    python poly_fakegithub.py serve [--fixture FILE] [--port PORT] ...
+    python poly_fakegithub.py record -o FILE [-q QUERY ...] [-n COUNT]
+"""
+import argparse
+import base64
+import hashlib
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+TOPICS = ["actions", "ai", "automation", "ci", "devops", "github-actions",
+          "python", "testing", "security", "cli"]
+
+# Per-resource (requests, period in seconds) served before returning 403
+DEFAULT_LIMITS = {
+    "search": (30, 60),
+    "core": (5000, 3600),
+    "graphql": (5000, 3600),
+}
+
+
+def synthetic_repositories(count=1000, seed=0):
+    """
+    Generate repositories in the REST API layout.
+
+    Args:
+        count (int): Number of repositories
+        seed (int): Random seed, so runs are repeatable
+
+    Returns:
+        list: Repository dicts
+    """
+    rng = random.Random(seed)
+    epoch = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    repos = []
+    for i in range(count):
+        owner = f"owner{i % 97}"
+        name = f"tool-{i}"
+        pushed = epoch + timedelta(seconds=rng.randrange(60 * 60 * 24 * 365))
+        repos.append({
+            "id": 100000 + i,
+            "full_name": f"{owner}/{name}",
+            "html_url": f"https://github.com/{owner}/{name}",
+            "description": f"Synthetic {rng.choice(TOPICS)} tool {i}",
+            "stargazers_count": int(rng.paretovariate(1.2) * 10),
+            "forks_count": int(rng.paretovariate(1.5) * 3),
+            "watchers_count": rng.randrange(500),
+            "open_issues_count": rng.randrange(200),
+            "topics": rng.sample(TOPICS, rng.randrange(1, 4)),
+            "pushed_at": pushed.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        })
+    return repos
+
+
+def load_fixture(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def record_fixture(path, queries, count=100):
+    """
+    Record repositories from the live GitHub search API into a fixture.
+
+    Args:
+        path (str): Output JSON file
+        queries (list): Search queries to record
+        count (int): Repositories to record per query
+
+    Returns:
+        int: Number of distinct repositories written
+    """
+    import poly_framework
+
+    repos = {}
+    page_size = min(count, poly_framework.SEARCH_MAX_PAGE_SIZE)
+    for query in queries:
+        for page in range(1, -(-count // page_size) + 1):
+            data = poly_framework._github_get("/search/repositories", params={
+                "q": query, "sort": "stars", "order": "desc",
+                "per_page": page_size, "page": page,
+            })
+            for repo in data.get("items", []):
+                repos.setdefault(repo["id"], repo)
+            if len(data.get("items", [])) < page_size:
+                break
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(list(repos.values()), f, indent=1)
+    return len(repos)
+
+
+def _search_terms(q):
+    # Drop qualifiers such as pushed:>... or sort:stars-desc
+    return [t.lower() for t in q.split() if ":" not in t]
+
+
+def _pushed_filters(q):
+    # pushed:>X, pushed:>=X, pushed:<X, pushed:<=X and pushed:A..B, compared
+    # as ISO 8601 strings like GitHub's own timestamps
+    filters = []
+    for token in q.split():
+        if not token.startswith("pushed:"):
+            continue
+        value = token[len("pushed:"):]
+        if ".." in value:
+            low, high = value.split("..", 1)
+            filters.append(lambda p, low=low, high=high:
+                           (low == "*" or p >= low) and (high == "*" or p <= high))
+        elif value.startswith(">="):
+            filters.append(lambda p, v=value[2:]: p >= v)
+        elif value.startswith(">"):
+            filters.append(lambda p, v=value[1:]: p > v)
+        elif value.startswith("<="):
+            filters.append(lambda p, v=value[2:]: p <= v)
+        elif value.startswith("<"):
+            filters.append(lambda p, v=value[1:]: p < v)
+        else:
+            filters.append(lambda p, v=value: p.startswith(v))
+    return filters
+
+
+def _matches(repo, terms, filters=()):
+    haystack = " ".join([repo["full_name"], repo.get("description") or "",
+                         " ".join(repo.get("topics") or [])]).lower()
+    pushed = repo.get("pushed_at") or ""
+    return all(t in haystack for t in terms) and all(f(pushed) for f in filters)
+
+
+def _graphql_node(repo):
+    return {
+        "databaseId": repo["id"],
+        "nameWithOwner": repo["full_name"],
+        "url": repo["html_url"],
+        "stargazerCount": repo["stargazers_count"],
+        "forkCount": repo["forks_count"],
+        "repositoryTopics": {"nodes": [{"topic": {"name": t}} for t in repo.get("topics") or []]},
+        "issues": {"totalCount": repo.get("open_issues_count", 0)},
+        "pullRequests": {"totalCount": repo.get("open_pull_requests_count", 0)},
+        "releases": {"totalCount": repo.get("releases_count", 0)},
+        "watchers": {"totalCount": repo.get("watchers_count", 0)},
+        "pushedAt": repo.get("pushed_at"),
+    }
+
+
+class FakeGitHub:
+    """
+    Local HTTP server standing in for api.github.com.
+
+    Serves GET /search/repositories, GET /repos/{owner}/{repo} and
+    POST /graphql from a list of repositories. Responses carry ETags (and
+    honour If-None-Match with 304), plus X-RateLimit-* headers counted per
+    resource, with 304s free as on GitHub; exhausted budgets answer 403. Latency, jitter and injected
+    5xx errors or secondary rate limits make the client paths measurable.
+    """
+
+    def __init__(self, repos=None, latency=0.0, jitter=0.0, error_rate=0.0,
+                 secondary_rate=0.0, limits=None, seed=0, host="127.0.0.1", port=0):
+        """
+        Args:
+            repos (list): Repositories to serve, defaults to synthetic ones
+            latency (float): Base response delay in seconds
+            jitter (float): Uniform random delay added on top, in seconds
+            error_rate (float): Share of requests answered with 502
+            secondary_rate (float): Share of requests answered with a 403
+                secondary rate limit and Retry-After
+            limits (dict): Per-resource (requests, period) budgets
+            seed (int): Random seed for jitter and error injection
+            host (str): Interface to bind
+            port (int): Port to bind, 0 picks a free one
+        """
+        self.repos = repos if repos is not None else synthetic_repositories(seed=seed)
+        self.by_name = {r["full_name"]: r for r in self.repos}
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.secondary_rate = secondary_rate
+        self.limits = dict(limits or DEFAULT_LIMITS)
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._windows = {}
+        self.counts = {}
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _count(self, key):
+        with self._lock:
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+    def _rate_limit(self, resource, charge=True):
+        # Returns the rate-limit headers and whether the budget is exhausted;
+        # charge=False reports the window without using it, as for a 304
+        limit, period = self.limits[resource]
+        now = time.time()
+        with self._lock:
+            reset, used = self._windows.get(resource, (now + period, 0))
+            if now >= reset:
+                reset, used = now + period, 0
+            exhausted = charge and used >= limit
+            if charge and not exhausted:
+                used += 1
+            self._windows[resource] = (reset, used)
+        headers = {
+            "X-RateLimit-Limit": str(limit),
+            "X-RateLimit-Remaining": str(max(0, limit - used)),
+            "X-RateLimit-Reset": str(int(reset)),
+            "X-RateLimit-Resource": resource,
+        }
+        return headers, exhausted
+
+    def _chaos(self):
+        with self._lock:
+            delay = self.latency + self._rng.uniform(0, self.jitter)
+            roll = self._rng.random()
+        if delay > 0:
+            time.sleep(delay)
+        if roll < self.error_rate:
+            return "error"
+        if roll < self.error_rate + self.secondary_rate:
+            return "secondary"
+        return None
+
+    def search(self, params):
+        q = params.get("q", [""])[0]
+        terms, filters = _search_terms(q), _pushed_filters(q)
+        per_page = min(int(params.get("per_page", [30])[0]), 100)
+        page = int(params.get("page", [1])[0])
+        hits = [r for r in self.repos if _matches(r, terms, filters)]
+        hits.sort(key=lambda r: r["stargazers_count"], reverse=True)
+        start = (page - 1) * per_page
+        return {"total_count": len(hits), "incomplete_results": False,
+                "items": hits[start:start + per_page]}
+
+    def graphql(self, variables):
+        q = variables.get("q", "")
+        terms, filters = _search_terms(q), _pushed_filters(q)
+        first = min(int(variables.get("first") or 10), 100)
+        after = variables.get("after")
+        start = int(base64.b64decode(after)) if after else 0
+        hits = [r for r in self.repos if _matches(r, terms, filters)]
+        hits.sort(key=lambda r: r["stargazers_count"], reverse=True)
+        end = start + first
+        return {"data": {"rateLimit": {"cost": 1}, "search": {
+            "pageInfo": {
+                "hasNextPage": end < len(hits),
+                "endCursor": base64.b64encode(str(end).encode()).decode(),
+            },
+            "nodes": [_graphql_node(r) for r in hits[start:end]],
+        }}}
+
+    def _handler_class(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status, payload=None, headers=None):
+                body = json.dumps(payload).encode() if payload is not None else b""
+                self.send_response(status)
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _serve(self, resource, produce):
+                fake._count(resource)
+                chaos = fake._chaos()
+                if chaos == "error":
+                    return self._send(502, {"message": "Injected error"})
+                if chaos == "secondary":
+                    return self._send(403, {"message": "You have exceeded a secondary rate limit"},
+                                      {"Retry-After": "1"})
+                payload = produce()
+                etag = None
+                if payload is not None:
+                    etag = '"%s"' % hashlib.sha1(
+                        json.dumps(payload, sort_keys=True).encode()).hexdigest()
+                # Like GitHub, a 304 does not count against the rate limit
+                not_modified = etag is not None and self.headers.get("If-None-Match") == etag
+                headers, exhausted = fake._rate_limit(resource, charge=not not_modified)
+                if exhausted:
+                    return self._send(403, {"message": "API rate limit exceeded"}, headers)
+                if payload is None:
+                    return self._send(404, {"message": "Not Found"}, headers)
+                headers["ETag"] = etag
+                if not_modified:
+                    return self._send(304, None, headers)
+                return self._send(200, payload, headers)
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                params = parse_qs(url.query)
+                if url.path == "/search/repositories":
+                    return self._serve("search", lambda: fake.search(params))
+                if url.path.startswith("/repos/"):
+                    name = url.path[len("/repos/"):]
+                    return self._serve("core", lambda: fake.by_name.get(name))
+                return self._send(404, {"message": "Not Found"})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                if urlparse(self.path).path == "/graphql":
+                    return self._serve("graphql",
+                                       lambda: fake.graphql(request.get("variables") or {}))
+                return self._send(404, {"message": "Not Found"})
+
+        return Handler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline GitHub API stand-in")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    serve = sub.add_parser("serve", help="Serve fixtures over HTTP")
+    serve.add_argument("--fixture", help="JSON list of repositories (default: synthetic)")
+    serve.add_argument("--repos", type=int, default=1000, help="Synthetic repositories")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--latency", type=float, default=0.0)
+    serve.add_argument("--jitter", type=float, default=0.0)
+    serve.add_argument("--error-rate", type=float, default=0.0)
+    serve.add_argument("--secondary-rate", type=float, default=0.0)
+
+    record = sub.add_parser("record", help="Record live search results to a fixture")
+    record.add_argument("-o", "--output", required=True)
+    record.add_argument("-q", "--query", action="append", default=None)
+    record.add_argument("-n", "--count", type=int, default=100)
+
+    args = parser.parse_args(argv)
+    if args.command == "record":
+        written = record_fixture(args.output, args.query or ["automation"], args.count)
+        print(f"Recorded {written} repositories to {args.output}")
+        return
+
+    repos = load_fixture(args.fixture) if args.fixture else synthetic_repositories(args.repos)
+    fake = FakeGitHub(repos, latency=args.latency, jitter=args.jitter,
+                      error_rate=args.error_rate, secondary_rate=args.secondary_rate,
+                      host=args.host, port=args.port)
+    print(f"Serving {len(repos)} repositories at {fake.url} (Ctrl-C to stop)")
+    try:
+        fake._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        fake._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,56 +1,719 @@
 """
 Poly-AI Framework for Adaptive GitHub Workflow Automation
 """
+import heapq
+import importlib.util
 import os
-import requests
-import numpy as np
-from github import Github
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 
-def rank_tools(tools, weights):
+from poly_budget import APIBudget, BudgetExceeded
+from poly_cache import HTTPCache, SingleFlight, TTLCache
+from poly_metrics import METRICS
+from poly_ratelimit import RateLimitScheduler
+from poly_resilience import CircuitBreaker, CircuitOpenError, resilient_call
+
+def _lazy_import(name):
+    """
+    Import a module on first attribute access.
+    
+    Keeps numpy, requests and the ranking/storage modules out of the import
+    path of callers that only need cheap helpers such as pick_workflow_type.
+    
+    Args:
+        name (str): Module name
+        
+    Returns:
+        module: The module, loaded lazily if it was not imported yet
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+np = _lazy_import("numpy")
+poly_daemon = _lazy_import("poly_daemon")
+poly_profile = _lazy_import("poly_profile")
+poly_ranking = _lazy_import("poly_ranking")
+poly_store = _lazy_import("poly_store")
+poly_transport = _lazy_import("poly_transport")
+
+# Rows scored per block when ranking an on-disk MetricMatrix
+RANKING_CHUNK_ROWS = 1 << 18
+
+# Default metric weights: stars, forks, actions topic, AI topic
+RANKING_WEIGHTS = [0.4, 0.3, 0.2, 0.1]
+
+# Tools a pipeline run prints, matching fetch_github_tools' default page
+PIPELINE_TOP_K = 8
+
+def _ranking_matrix(tools):
+    if isinstance(tools, poly_store.ToolStore):
+        tools = tools.to_catalog()
+    if isinstance(tools, poly_ranking.ToolCatalog):
+        return tools, tools.metrics
+    if isinstance(tools, poly_ranking.MetricMatrix):
+        # Scored chunk by chunk in _top_k rather than loaded whole
+        return tools, None
+    return tools, np.array([t['metrics'] for t in tools])
+
+def _weight_matrix(weights):
+    # Returns profile names (or None) and weights as a vector or a
+    # (profiles x metrics) matrix
+    if isinstance(weights, dict):
+        return list(weights), np.array(list(weights.values()), dtype=float)
+    return None, np.array(weights, dtype=float)
+
+def _top_k(tools, matrix, weights, k, processes=None):
+    if processes and processes > 1:
+        with poly_ranking.ShardedRanker(processes, chunk_rows=RANKING_CHUNK_ROWS) as ranker:
+            return ranker.top_k(tools if isinstance(tools, poly_ranking.MetricMatrix) else matrix, weights, k)
+    if isinstance(tools, poly_ranking.MetricMatrix):
+        return poly_ranking.top_k_chunked(tools.chunks(RANKING_CHUNK_ROWS), weights, k)
+    if weights.ndim == 1:
+        return poly_ranking.top_k(matrix @ weights, k)
+    return poly_ranking.top_k_batched(matrix @ weights.T, k)
+
+def rank_tools(tools, weights, k=None, processes=None):
     """
     Rank tools based on weighted metrics using linear algebra.
     
+    Several weight profiles can be ranked at once by passing a weight
+    matrix (profiles x metrics) or a dict of named weight vectors; every
+    profile is then scored in a single matrix-matrix product.
+    
+    Args:
+        tools (list): List of tools with metrics, a ToolCatalog whose metric
+            matrix is used as-is, a ToolStore read straight into one, or an
+            on-disk MetricMatrix scored in chunks (requires k)
+        weights (list): Weights for each metric, a weight matrix with one
+            row per profile, or a dict mapping profile names to weights
+        k (int): Only return the k best tools, selected with a partial sort
+        processes (int): Shard top-k selection across this many worker
+            processes sharing the metric matrix
+        
+    Returns:
+        list: Sorted list of tools with scores; for several profiles, one
+        such list per profile (a dict keyed on name for dict weights)
+    """
+    tools, matrix = _ranking_matrix(tools)
+    names, weights = _weight_matrix(weights)
+    if matrix is not None and not len(matrix):
+        # No tools: give the empty matrix the weights' width so it still multiplies
+        matrix = np.empty((0, weights.shape[-1]))
+    if k is None:
+        if isinstance(tools, poly_ranking.MetricMatrix):
+            raise ValueError("k is required when ranking an on-disk MetricMatrix")
+        if weights.ndim == 1:
+            return sorted(zip(tools, matrix @ weights), key=lambda x: x[1], reverse=True)
+        k = len(tools)
+    
+    indices, top_scores = _top_k(tools, matrix, weights, k, processes)
+    if weights.ndim == 1:
+        return [(tools[i], score) for i, score in zip(indices, top_scores)]
+    rankings = [
+        [(tools[i], score) for i, score in zip(profile_indices, profile_scores)]
+        for profile_indices, profile_scores in zip(indices, top_scores)
+    ]
+    return dict(zip(names, rankings)) if names is not None else rankings
+
+def rank_tools_top_k(tools, weights, k=10, processes=None):
+    """
+    Return the positions and scores of the k best tools.
+    
+    Scores are computed in one matrix product (chunk by chunk for an
+    on-disk MetricMatrix) and selected with np.argpartition, so no
+    per-tool Python objects are built.
+    
     Args:
-        tools (list): List of tools with metrics
+        tools (list): List of tools with metrics, a ToolCatalog, a ToolStore
+            or a MetricMatrix
+        weights (list): Weights for each metric, or a weight matrix with one
+            row per profile
+        k (int): Number of tools to select
+        processes (int): Shard the selection across this many worker
+            processes sharing the metric matrix
+        
+    Returns:
+        tuple: (indices, scores) NumPy arrays, best first; shaped
+        (profiles, k) for a weight matrix
+    """
+    tools, matrix = _ranking_matrix(tools)
+    _, weights = _weight_matrix(weights)
+    return _top_k(tools, matrix, weights, k, processes)
+
+def rank_tools_streaming(pages, weights, k=10):
+    """
+    Keep a running top-k ranking over pages of tools as they arrive.
+    
+    Only the k best tools seen so far are retained, so memory stays bounded
+    regardless of how many pages are consumed.
+    
+    Args:
+        pages (iterable): Iterable of tool lists, e.g. iter_github_tools()
         weights (list): Weights for each metric
+        k (int): Number of top tools to keep
+        
+    Yields:
+        list: Current top-k (tool, score) pairs, best first, after each page
+    """
+    weights = np.array(weights)
+    heap = []
+    seen = 0
+    for page in pages:
+        if not page:
+            continue
+        scores = np.array([t['metrics'] for t in page]) @ weights
+        for tool, score in zip(page, scores):
+            # Sequence number breaks ties without comparing tool dicts
+            entry = (score, -seen, tool)
+            seen += 1
+            if len(heap) < k:
+                heapq.heappush(heap, entry)
+            elif entry[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, entry)
+        yield [(tool, score) for score, _, tool in sorted(heap, key=lambda e: e[:2], reverse=True)]
+
+GITHUB_API = "https://api.github.com"
+
+# GitHub's largest search page size and hard cap on reachable results
+SEARCH_MAX_PAGE_SIZE = 100
+SEARCH_RESULT_LIMIT = 1000
+
+# Search pages fetched in parallel once the total count is known
+PAGE_CONCURRENCY = 4
+
+# Retries of a request rejected by a primary or secondary rate limit
+RATE_LIMIT_RETRIES = 3
+
+API_REQUESTS = METRICS.counter("poly_api_requests", "Upstream API requests by HTTP status",
+                               ("api", "status"))
+API_BYTES = METRICS.counter("poly_api_bytes", "Response body bytes received from upstream APIs",
+                            ("api",))
+API_CACHE_HITS = METRICS.counter("poly_api_cache_hits",
+                                 "Responses replayed from the HTTP cache after a 304", ("api",))
+API_LATENCY = METRICS.histogram("poly_api_request_seconds", "Upstream API request latency",
+                                ("api",))
+API_COST = METRICS.counter("poly_api_cost", "GitHub rate-limit points spent", ("api",))
+
+def _record_api_call(api, response, elapsed):
+    from_cache = getattr(response, "from_cache", False)
+    API_REQUESTS.inc(api=api, status=304 if from_cache else response.status_code)
+    API_LATENCY.observe(elapsed, api=api)
+    if from_cache:
+        API_CACHE_HITS.inc(api=api)
+    else:
+        API_BYTES.inc(len(response.content), api=api)
+
+_default_cache = None
+_default_scheduler = None
+_default_transport = None
+_default_budget = None
+_recommendation_cache = None
+_recommendation_flight = SingleFlight()
+_defaults_lock = threading.Lock()
+
+def default_http_cache():
+    """
+    Return the process-wide HTTP cache used by fetch_github_tools.
+    
+    The cache lives in POLY_CACHE_DIR (default ~/.cache/poly_framework/http)
+    and is bounded by POLY_CACHE_MAX_BYTES. Setting POLY_CACHE_DIR to an
+    empty string disables caching.
+    
+    Returns:
+        HTTPCache: Shared cache instance, or None when caching is disabled
+    """
+    global _default_cache
+    with _defaults_lock:
+        if _default_cache is None:
+            directory = os.getenv(
+                "POLY_CACHE_DIR",
+                os.path.join(os.path.expanduser("~"), ".cache", "poly_framework", "http"),
+            )
+            if not directory:
+                return None
+            max_bytes = int(os.getenv("POLY_CACHE_MAX_BYTES", 50 * 1024 * 1024))
+            _default_cache = HTTPCache(directory, max_bytes=max_bytes)
+        return _default_cache
+
+def default_transport():
+    """
+    Return the process-wide pooled HTTP transport used by all API clients.
+    
+    Pool size, read timeout and retry count can be tuned with
+    POLY_HTTP_POOL_SIZE, POLY_HTTP_TIMEOUT and POLY_HTTP_RETRIES.
+    
+    Returns:
+        Transport: Shared transport instance
+    """
+    global _default_transport
+    with _defaults_lock:
+        if _default_transport is None:
+            pool_size = int(os.getenv("POLY_HTTP_POOL_SIZE", 10))
+            _default_transport = poly_transport.Transport(
+                pool_maxsize=pool_size,
+                read_timeout=float(os.getenv("POLY_HTTP_TIMEOUT", 30)),
+                retries=int(os.getenv("POLY_HTTP_RETRIES", 3)),
+            )
+        return _default_transport
+
+def default_scheduler():
+    """
+    Return the process-wide rate-limit scheduler shared by all GitHub calls.
+    
+    Tokens are read from GITHUB_TOKENS (comma-separated), falling back to
+    GITHUB_TOKEN; without either, requests are scheduled anonymously.
+    
+    Returns:
+        RateLimitScheduler: Shared scheduler instance
+    """
+    global _default_scheduler
+    with _defaults_lock:
+        if _default_scheduler is None:
+            tokens = os.getenv("GITHUB_TOKENS") or os.getenv("GITHUB_TOKEN") or ""
+            _default_scheduler = RateLimitScheduler([t.strip() for t in tokens.split(",")])
+        return _default_scheduler
+
+def default_budget():
+    """
+    Return the process-wide API budget charged by every GitHub call.
+    
+    POLY_API_BUDGET caps the rate-limit points a run may spend and
+    POLY_API_QUERY_BUDGET caps each discovery query; both are unlimited
+    when unset. Once a budget is spent, searches are answered from the
+    HTTP cache without revalidation and uncached requests are refused.
+    
+    Returns:
+        APIBudget: Shared budget instance
+    """
+    global _default_budget
+    with _defaults_lock:
+        if _default_budget is None:
+            limit = os.getenv("POLY_API_BUDGET")
+            per_query = os.getenv("POLY_API_QUERY_BUDGET")
+            _default_budget = APIBudget(int(limit) if limit else None,
+                                        int(per_query) if per_query else None)
+        return _default_budget
+
+def _github_headers(token):
+    headers = {"Accept": "application/vnd.github+json"}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    return headers
+
+def _github_request(method, path, resource, cache=None, query=None, **kwargs):
+    """
+    Issue a GitHub API request paced and authenticated by the scheduler.
+    
+    Requests rejected by a rate limit are retried on whichever token the
+    scheduler hands out next, after any Retry-After back-off has elapsed.
+    Each attempt reserves its point in the default budget before it is
+    sent; once the budget is spent, cached GETs are replayed without
+    revalidation.
+    
+    Args:
+        method (str): HTTP method
+        path (str): API path, e.g. "/search/repositories"
+        resource (str): Rate-limit resource ("core", "search" or "graphql")
+        cache (HTTPCache): Conditional-request cache for GET requests, or None
+        query (str): Discovery query the request is accounted to
+        **kwargs: Passed through to requests
+        
+    Returns:
+        requests.Response: Successful response
+        
+    Raises:
+        BudgetExceeded: If the budget is spent and nothing is cached
+    """
+    scheduler = default_scheduler()
+    transport = default_transport()
+    budget = default_budget()
+    url = GITHUB_API + path
+    api = "graphql" if resource == "graphql" else "rest"
+    for _ in range(RATE_LIMIT_RETRIES + 1):
+        # Reserve the point before sending, so concurrent pages cannot all
+        # pass the check before any of them is charged
+        if not budget.try_spend(query):
+            stale = cache.peek(url, kwargs.get("params")) if method == "GET" and cache else None
+            if stale is None:
+                budget.record_denied(query)
+                raise BudgetExceeded(f"API budget spent; refusing {method} {path}")
+            budget.record_stale(stale, query)
+            return stale
+        token = scheduler.acquire(resource)
+        headers = _github_headers(token)
+        started = time.monotonic()
+        if method == "GET" and cache is not None:
+            r = cache.get(url, headers=headers, session=transport, **kwargs)
+        else:
+            r = transport.request(method, url, headers=headers, **kwargs)
+        _record_api_call(api, r, time.monotonic() - started)
+        budget.record(api, r, query)
+        if api == "rest" and not getattr(r, "from_cache", False):
+            API_COST.inc(api=api)
+        if not scheduler.update(token, resource, r):
+            break
+    r.raise_for_status()
+    return r
+
+def _github_get(path, params=None, cache=None, query=None):
+    """
+    GET a GitHub REST endpoint, revalidating through the cache when given.
+    
+    Args:
+        path (str): API path, e.g. "/search/repositories"
+        params (dict): Query parameters
+        cache (HTTPCache): Conditional-request cache, or None
+        query (str): Discovery query the request is accounted to
         
     Returns:
-        list: Sorted list of tools with scores
+        dict: Decoded JSON payload
+    """
+    resource = "search" if path.startswith("/search/") else "core"
+    return _github_request("GET", path, resource, cache=cache, query=query,
+                           params=params).json()
+
+def _tool_from_repo(repo):
+    topics = repo.get("topics") or []
+    return {
+        "id": repo["id"],
+        "name": repo["full_name"],
+        "metrics": [
+            repo["stargazers_count"],
+            repo["forks_count"],
+            int("actions" in topics),
+            int("ai" in topics)
+        ],
+        "url": repo["html_url"],
+        "pushed_at": repo.get("pushed_at")
+    }
+
+def iter_github_tools(query="automation", per_page=8, cache=None, budget_query=None):
+    """
+    Stream top GitHub tools page by page as search results arrive.
+    
+    The API page size follows per_page (up to 100 results per page). Once
+    the first page reports the total count, any further pages are fetched
+    concurrently and yielded in order.
+    
+    Args:
+        query (str): Search query for GitHub repositories
+        per_page (int): Number of repositories to fetch in total
+        cache (HTTPCache): Cache to use, defaults to default_http_cache()
+        budget_query (str): Query the API spend is accounted to, defaults
+            to query
+        
+    Yields:
+        list: Tools from one search page, with their metrics
+        
+    Raises:
+        BudgetExceeded: If the API budget runs out on an uncached page
     """
-    matrix = np.array([t['metrics'] for t in tools])
-    scores = matrix @ np.array(weights)
-    return sorted(zip(tools, scores), key=lambda x: x[1], reverse=True)
+    if cache is None:
+        cache = default_http_cache()
+    if budget_query is None:
+        budget_query = query
+    
+    # Request exactly as many results per page as the caller asked for
+    page_size = max(1, min(per_page, SEARCH_MAX_PAGE_SIZE))
+    
+    def search_page(page):
+        # Search for repositories
+        return _github_get("/search/repositories", params={
+            "q": query,
+            "sort": "stars",
+            "order": "desc",
+            "per_page": page_size,
+            "page": page,
+        }, cache=cache, query=budget_query)
+    
+    first = search_page(1)
+    items = first.get("items", [])[:per_page]
+    if not items:
+        return
+    yield [_tool_from_repo(repo) for repo in items]
+    
+    # The first page tells us how many results exist; fetch the rest at once
+    total = min(per_page, first.get("total_count", 0), SEARCH_RESULT_LIMIT)
+    last_page = -(-total // page_size)
+    if last_page < 2 or len(items) < page_size:
+        return
+    
+    fetched = len(items)
+    with ThreadPoolExecutor(max_workers=min(PAGE_CONCURRENCY, last_page - 1)) as pool:
+        for data in pool.map(search_page, range(2, last_page + 1)):
+            items = data.get("items", [])[:per_page - fetched]
+            if not items:
+                break
+            fetched += len(items)
+            yield [_tool_from_repo(repo) for repo in items]
 
-def fetch_github_tools(query="automation", per_page=8):
+def fetch_github_tools(query="automation", per_page=8, cache=None):
     """
     Fetch top GitHub tools based on stars and other metrics.
     
+    Search pages are requested conditionally through an on-disk ETag cache,
+    so unchanged pages are answered with 304 and do not count against the
+    primary rate limit. If the API budget runs out, the tools gathered so
+    far are returned.
+    
     Args:
         query (str): Search query for GitHub repositories
         per_page (int): Number of repositories to fetch
+        cache (HTTPCache): Cache to use, defaults to default_http_cache()
         
     Returns:
         list: List of tools with their metrics
     """
-    # Initialize GitHub client
-    g = Github(os.getenv("GITHUB_TOKEN"))
+    tools = []
+    try:
+        for page in iter_github_tools(query, per_page, cache):
+            tools.extend(page)
+    except BudgetExceeded:
+        pass
+    return tools
+
+def fetch_github_tools_many(queries, per_page=8, max_concurrency=4, cache=None):
+    """
+    Fetch GitHub tools for several search queries concurrently.
+    
+    Each query is run through fetch_github_tools on a bounded thread pool.
+    Results are merged in query order and de-duplicated on repository id,
+    keeping the first occurrence of each repository.
+    
+    Args:
+        queries (list): Search queries for GitHub repositories
+        per_page (int): Number of repositories to fetch per query
+        max_concurrency (int): Maximum number of searches in flight
+        cache (HTTPCache): Cache to use, defaults to default_http_cache()
+        
+    Returns:
+        list: De-duplicated list of tools with their metrics
+    """
+    queries = list(queries)
+    if not queries:
+        return []
+    if cache is None:
+        cache = default_http_cache()
+    
+    workers = max(1, min(max_concurrency, len(queries)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        batches = list(pool.map(lambda q: fetch_github_tools(q, per_page, cache), queries))
+    
+    merged = {}
+    for batch in batches:
+        for tool in batch:
+            merged.setdefault(tool["id"], tool)
+    return list(merged.values())
+
+CURSOR_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+def _search_total(search, query):
+    # Same request as the first page iter_github_tools sends for a window,
+    # so the HTTP cache replays it when the window is then fetched
+    return _github_get("/search/repositories", params={
+        "q": search,
+        "sort": "stars",
+        "order": "desc",
+        "per_page": SEARCH_MAX_PAGE_SIZE,
+        "page": 1,
+    }, cache=default_http_cache(), query=query).get("total_count", 0)
+
+def sync_github_tools(store, query="automation", per_page=100, full=False, index=None):
+    """
+    Incrementally sync a discovery query into a local tool store.
+    
+    After the first sync only repositories pushed since the query's stored
+    cursor are requested, so refresh cost scales with churn rather than
+    catalogue size. The pushed: range since the cursor is halved until the
+    search API can return all of it (SEARCH_RESULT_LIMIT results), and the
+    cursor moves to the end of each range once every page of it is stored.
+    Pass full=True to rescan everything, e.g. to pick up star and fork
+    changes on repositories that have not been pushed to.
+    
+    Args:
+        store (ToolStore): Store to sync into
+        query (str): Search query for GitHub repositories
+        per_page (int): Maximum number of repositories a full scan fetches
+        full (bool): Ignore the stored cursor and rescan the query
+        index (RankingIndex): Optional index to keep in step with the store
+        
+    Returns:
+        int: Number of tools that were new or changed
+    """
+    started = datetime.now(timezone.utc).replace(microsecond=0)
+    cursor = None if full else store.cursor(query)
+    changed = 0
+    
+    def fetch(search, limit):
+        nonlocal changed
+        # Account the spend to the base query, not the window-specific search
+        for page in iter_github_tools(search, limit, budget_query=query):
+            changed += store.upsert(page)
+            if index is not None:
+                index.add(page)
+    
+    def window(low, high):
+        return f"{query} pushed:{low.strftime(CURSOR_FORMAT)}..{high.strftime(CURSOR_FORMAT)}"
+    
+    try:
+        if not cursor:
+            # A full scan keeps the top per_page tools
+            fetch(query, per_page)
+            store.set_cursor(query, started.strftime(CURSOR_FORMAT))
+            return changed
+        low = datetime.strptime(cursor, CURSOR_FORMAT).replace(tzinfo=timezone.utc)
+        while low < started:
+            high = started
+            # A one-second range cannot be split further; it keeps its top results
+            while (high - low > timedelta(seconds=1)
+                   and _search_total(window(low, high), query) > SEARCH_RESULT_LIMIT):
+                high = (low + (high - low) / 2).replace(microsecond=0)
+            fetch(window(low, high), SEARCH_RESULT_LIMIT)
+            store.set_cursor(query, high.strftime(CURSOR_FORMAT))
+            low = high
+    except BudgetExceeded:
+        # The cursor only covers ranges that were stored completely, so the
+        # next sync picks up what was skipped
+        pass
+    return changed
+
+# GraphQL selections and extractors for each metric the GraphQL backend can
+# return. The first four mirror the REST metric vector used by rank_tools.
+_TOPICS_SELECTION = "repositoryTopics(first: 50) { nodes { topic { name } } }"
+
+def _graphql_topics(node):
+    return {t["topic"]["name"] for t in node["repositoryTopics"]["nodes"]}
+
+def _graphql_timestamp(value):
+    if not value:
+        return 0
+    return int(datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp())
+
+GRAPHQL_METRICS = {
+    "stars": ("stargazerCount", lambda n: n["stargazerCount"]),
+    "forks": ("forkCount", lambda n: n["forkCount"]),
+    "actions": (_TOPICS_SELECTION, lambda n: int("actions" in _graphql_topics(n))),
+    "ai": (_TOPICS_SELECTION, lambda n: int("ai" in _graphql_topics(n))),
+    "open_issues": ("issues(states: OPEN) { totalCount }", lambda n: n["issues"]["totalCount"]),
+    "open_pull_requests": ("pullRequests(states: OPEN) { totalCount }", lambda n: n["pullRequests"]["totalCount"]),
+    "releases": ("releases { totalCount }", lambda n: n["releases"]["totalCount"]),
+    "watchers": ("watchers { totalCount }", lambda n: n["watchers"]["totalCount"]),
+    "pushed_at": ("pushedAt", lambda n: _graphql_timestamp(n["pushedAt"])),
+}
+
+DEFAULT_METRICS = ("stars", "forks", "actions", "ai")
+
+# GraphQL connections return at most 100 nodes per page
+GRAPHQL_PAGE_SIZE = 100
+
+def _graphql_search_query(metrics):
+    selections = []
+    for name in metrics:
+        selection = GRAPHQL_METRICS[name][0]
+        if selection not in selections:
+            selections.append(selection)
+    fields = "\n          ".join(selections)
+    return f"""
+query($q: String!, $first: Int!, $after: String) {{
+  rateLimit {{ cost }}
+  search(query: $q, type: REPOSITORY, first: $first, after: $after) {{
+    pageInfo {{ hasNextPage endCursor }}
+    nodes {{
+      ... on Repository {{
+          databaseId
+          nameWithOwner
+          url
+          {fields}
+      }}
+    }}
+  }}
+}}"""
+
+def _github_graphql(document, variables, query=None):
+    """
+    POST a query to the GitHub GraphQL endpoint.
     
-    # Search for repositories
-    repos = g.search_repositories(query=query, sort="stars", order="desc")
+    The rateLimit.cost GitHub reports for the query, when selected, is
+    charged to the default budget.
+    
+    Args:
+        document (str): GraphQL document
+        variables (dict): Query variables
+        query (str): Discovery query the request is accounted to
+        
+    Returns:
+        dict: The "data" member of the response
+    """
+    r = _github_request("POST", "/graphql", "graphql", query=query,
+                        json={"query": document, "variables": variables})
+    payload = r.json()
+    cost = ((payload.get("data") or {}).get("rateLimit") or {}).get("cost")
+    if cost is not None:
+        default_budget().charge(cost, query)
+        API_COST.inc(cost, api="graphql")
+    if payload.get("errors"):
+        raise RuntimeError(f"GitHub GraphQL error: {payload['errors'][0].get('message')}")
+    return payload["data"]
+
+def fetch_github_tools_graphql(query="automation", per_page=8, metrics=DEFAULT_METRICS):
+    """
+    Fetch top GitHub tools and all requested metrics through GraphQL.
+    
+    Every metric for up to 100 repositories is fetched in a single query,
+    so enrichment costs one round-trip per page instead of one per repo
+    and field. Requires GITHUB_TOKEN, as GraphQL rejects anonymous calls.
+    If the API budget runs out, the tools gathered so far are returned.
+    
+    Args:
+        query (str): Search query for GitHub repositories
+        per_page (int): Number of repositories to fetch
+        metrics (tuple): Metric names from GRAPHQL_METRICS, in the order
+            they should appear in each tool's metric vector
+        
+    Returns:
+        list: List of tools with their metrics
+    """
+    unknown = [m for m in metrics if m not in GRAPHQL_METRICS]
+    if unknown:
+        raise ValueError(f"Unknown metrics: {', '.join(unknown)}")
+    document = _graphql_search_query(metrics)
+    extractors = [GRAPHQL_METRICS[m][1] for m in metrics]
     
     results = []
-    for repo in repos[:per_page]:
-        results.append({
-            "name": repo.full_name,
-            "metrics": [
-                repo.stargazers_count,
-                repo.forks_count,
-                int("actions" in repo.topics),
-                int("ai" in repo.topics)
-            ],
-            "url": repo.html_url
-        })
-    return results
+    cursor = None
+    while len(results) < per_page:
+        try:
+            data = _github_graphql(document, {
+                "q": f"{query} sort:stars-desc",
+                "first": min(GRAPHQL_PAGE_SIZE, per_page - len(results)),
+                "after": cursor,
+            }, query=query)
+        except BudgetExceeded:
+            break
+        search = data["search"]
+        for node in search["nodes"]:
+            if not node:
+                continue
+            results.append({
+                "id": node["databaseId"],
+                "name": node["nameWithOwner"],
+                "metrics": [extract(node) for extract in extractors],
+                "url": node["url"]
+            })
+        if not search["pageInfo"]["hasNextPage"]:
+            break
+        cursor = search["pageInfo"]["endCursor"]
+    return results[:per_page]
 
 def pick_workflow_type(env):
     """
@@ -68,36 +731,326 @@ def pick_workflow_type(env):
         return "os_workflow.yml"
     return "default_workflow.yml"
 
+def default_recommendation_cache():
+    """
+    Return the TTL cache in front of fetch_tool_recommendations_perplexity.
+    
+    Entries live for POLY_RECOMMENDATION_TTL seconds (default one hour).
+    Setting POLY_RECOMMENDATION_CACHE_DIR also keeps them on disk across runs.
+    
+    Returns:
+        TTLCache: Shared cache instance
+    """
+    global _recommendation_cache
+    with _defaults_lock:
+        if _recommendation_cache is None:
+            _recommendation_cache = TTLCache(
+                ttl=float(os.getenv("POLY_RECOMMENDATION_TTL", 3600)),
+                directory=os.getenv("POLY_RECOMMENDATION_CACHE_DIR") or None,
+            )
+        return _recommendation_cache
+
+def _normalise_query(query):
+    return " ".join(query.lower().split())
+
+_MISS = object()
+
+# Time budget and retry policy for external recommendation sources
+RECOMMENDATION_DEADLINE = float(os.getenv("POLY_RECOMMENDATION_DEADLINE", 10))
+RECOMMENDATION_ATTEMPTS = 3
+
+# One breaker per external recommendation source
+RECOMMENDATION_BREAKERS = {
+    "perplexity": CircuitBreaker("perplexity", failure_threshold=5, reset_timeout=60),
+}
+
+class RecommendationSourceError(RuntimeError):
+    """Raised when a recommendation source answers with a server error."""
+
 def fetch_tool_recommendations_perplexity(query):
     """
     Fetch tool recommendations using Perplexity API.
     
+    Successful responses are cached per normalised query, and concurrent
+    callers asking the same query share a single upstream request. Each
+    call is bounded by RECOMMENDATION_DEADLINE with jittered retries, and
+    a circuit breaker fails fast while Perplexity keeps erroring, so a slow
+    dependency returns an empty result instead of stalling the pipeline.
+    
     Args:
         query (str): Query for tool recommendations
         
     Returns:
         dict: JSON response from Perplexity API
     """
-    # Note: This is a placeholder implementation
-    # In a real implementation, you would need to use the actual Perplexity API
-    r = requests.get(f"https://api.perplexity.ai/recommend/tools?q={query}")
-    return r.json() if r.status_code == 200 else []
+    key = _normalise_query(query)
+    cache = default_recommendation_cache()
+    cached = cache.get(key, _MISS)
+    if cached is not _MISS:
+        return cached
+    
+    def load():
+        # Another caller may have filled the cache while we were queued
+        cached = cache.get(key, _MISS)
+        if cached is not _MISS:
+            return cached
+        
+        def request(timeout):
+            # Note: This is a placeholder implementation
+            # In a real implementation, you would need to use the actual Perplexity API
+            started = time.monotonic()
+            # resilient_call owns the retries, so send each attempt once
+            r = default_transport().get("https://api.perplexity.ai/recommend/tools",
+                                        params={"q": key}, timeout=timeout, retry=False)
+            _record_api_call("perplexity", r, time.monotonic() - started)
+            if r.status_code >= 500 or r.status_code == 429:
+                raise RecommendationSourceError(f"Perplexity answered {r.status_code}")
+            return r
+        
+        try:
+            r = resilient_call(request, RECOMMENDATION_BREAKERS["perplexity"],
+                               deadline=RECOMMENDATION_DEADLINE,
+                               attempts=RECOMMENDATION_ATTEMPTS)
+        except (CircuitOpenError, TimeoutError, RecommendationSourceError, OSError):
+            return []
+        if r.status_code != 200:
+            return []
+        result = r.json()
+        cache.set(key, result)
+        return result
+    
+    return _recommendation_flight.do(key, load)
 
-if __name__ == "__main__":
-    # Define weights for ranking tools
-    weights = [0.4, 0.3, 0.2, 0.1]
+def refresh_ranking_index(index, query="automation", store=None):
+    """
+    Fetch current tools and fold them into a long-lived RankingIndex.
+    
+    With a store, the index is loaded from it once and then only tools
+    returned by the incremental sync are re-scored.
+    
+    Args:
+        index (RankingIndex): Index to update
+        query (str): Search query for GitHub repositories
+        store (ToolStore): Optional local tool store
+        
+    Returns:
+        int: Number of tools fetched (or changed, with a store)
+    """
+    if store is None:
+        tools = fetch_github_tools(query)
+        index.add(tools)
+        return len(tools)
+    if not len(index) and len(store):
+        index.add(store.to_catalog())
+    return sync_github_tools(store, query, index=index)
+
+def run_pipeline(report=None, metrics_file=None):
+    """
+    Discover and rank tools, then pick the workflow to deploy.
     
-    # Fetch GitHub tools
-    tools = fetch_github_tools()
+    Each stage is timed into METRICS alongside API call, byte and latency
+    metrics recorded by the HTTP helpers.
+    
+    Args:
+        report (str): Write a JSON run report here (default POLY_METRICS_REPORT)
+        metrics_file (str): Write Prometheus text here, e.g. a node exporter
+            textfile collector path (default POLY_METRICS_FILE)
+    """
+    weights = RANKING_WEIGHTS
+    report = report or os.getenv("POLY_METRICS_REPORT")
+    metrics_file = metrics_file or os.getenv("POLY_METRICS_FILE")
+    budget = default_budget()
+    budget.reset()
+    
+    # Fetch GitHub tools, syncing into a local store when one is configured
+    with METRICS.stage("fetch"):
+        store_path = os.getenv("POLY_STORE")
+        if store_path:
+            tools = poly_store.ToolStore(store_path)
+            sync_github_tools(tools)
+        else:
+            tools = fetch_github_tools()
     
     # Rank tools
-    ranked = rank_tools(tools, weights)
+    with METRICS.stage("rank"):
+        # A store keeps every tool ever synced; only show the best of them
+        ranked = rank_tools(tools, weights, k=PIPELINE_TOP_K)
     
     # Print ranked tools
     print("Top GitHub Automation Tools (Polymorphic Ranking):")
+    if not ranked and budget.report()["run"]["denied"]:
+        print("API budget exhausted, no cached data to rank")
     for i, (tool, score) in enumerate(ranked, 1):
         print(f"{i}. {tool['name']} ({tool['url']}) — Score: {score:.2f}")
     
     # Pick workflow type
-    selected_workflow = pick_workflow_type(os.environ)
-    print(f"Deploying workflow: {selected_workflow}")
\ No newline at end of file
+    with METRICS.stage("workflow"):
+        selected_workflow = pick_workflow_type(os.environ)
+    print(f"Deploying workflow: {selected_workflow}")
+    
+    # Report conditional-request cache effectiveness
+    cache = default_http_cache()
+    if cache is not None:
+        stats = cache.stats()
+        print(f"HTTP cache: {stats['hits']} hits, {stats['misses']} misses")
+    stats = default_transport().stats()
+    print(f"HTTP transport: {stats['requests']} requests over "
+          f"{stats['connections']} connections")
+    print("Stages: " + ", ".join(f"{name} {stage['last'] * 1000:.1f} ms"
+                                 for name, stage in METRICS.report()["stages"].items()))
+    spend = budget.report()["run"]
+    print(f"API budget: {spend['points']} points spent"
+          f"{f' of {budget.limit}' if budget.limit is not None else ''}, "
+          f"{spend['bytes'] / 1024:.1f} KiB received, {spend['cache_hits']} cache hits "
+          f"and {spend['stale_served']} stale pages saved {spend['bytes_saved'] / 1024:.1f} KiB")
+    
+    if report:
+        METRICS.write_report(report, extra={"clients": client_stats(), "tools": len(ranked),
+                                            "budget": budget.report()})
+    if metrics_file:
+        METRICS.write_textfile(metrics_file)
+
+def client_stats():
+    """
+    Return statistics of the shared HTTP cache, transport and scheduler.
+    
+    Returns:
+        dict: Per-client statistics
+    """
+    cache = default_http_cache()
+    return {
+        "http_cache": cache.stats() if cache is not None else None,
+        "transport": default_transport().stats(),
+        "rate_limits": default_scheduler().stats(),
+    }
+
+def run_daemon(args):
+    """
+    Run the long-lived daemon that replaces the cron-driven refresh cycle.
+    
+    The daemon keeps the HTTP cache, pooled transport, rate-limit scheduler
+    and a RankingIndex warm across jobs. The "refresh" job re-ranks tools
+    and the optional "update" job runs weekly_update.sh.
+    
+    Args:
+        args (argparse.Namespace): Parsed daemon options
+    """
+    import subprocess
+    
+    index = poly_ranking.RankingIndex(RANKING_WEIGHTS)
+    store_path = os.getenv("POLY_STORE")
+    store = poly_store.ToolStore(store_path) if store_path else None
+    
+    def refresh():
+        default_budget().reset()
+        with METRICS.stage("refresh"):
+            fetched = refresh_ranking_index(index, args.query, store)
+        return {"fetched": fetched, "indexed": len(index),
+                "workflow": pick_workflow_type(os.environ),
+                "budget": default_budget().report()["run"]}
+    
+    def update():
+        with METRICS.stage("update"):
+            proc = subprocess.run([args.update_command], capture_output=True, text=True)
+        return {"returncode": proc.returncode, "output": proc.stdout[-2000:] + proc.stderr[-2000:]}
+    
+    def top(request):
+        return [{"name": tool["name"], "url": tool["url"], "score": score}
+                for tool, score in index.top(int(request.get("k", 10)))]
+    
+    def job(name, fn):
+        # Profile each run when asked, and refresh the scrape file after
+        # every job so it never goes stale
+        def run():
+            try:
+                with poly_profile.profiled(args.profile, name, args.profile_dir):
+                    return fn()
+            finally:
+                if args.metrics_file:
+                    METRICS.write_textfile(args.metrics_file)
+        return run
+    
+    daemon = poly_daemon.Daemon(args.socket, status_extra=lambda: {"clients": client_stats()})
+    daemon.add_job("refresh", job("refresh", refresh), poly_daemon.parse_schedule(args.refresh),
+                   run_at_start=True)
+    if args.update:
+        daemon.add_job("update", job("update", update), poly_daemon.parse_schedule(args.update))
+    daemon.add_command("top", top)
+    daemon.add_command("metrics", lambda request: METRICS.report())
+    if args.metrics_port is not None:
+        import poly_metrics
+        
+        server = poly_metrics.serve_metrics(METRICS, args.metrics_port)
+        print(f"OpenMetrics endpoint on http://127.0.0.1:{server.server_address[1]}/metrics")
+    print(f"poly_framework daemon listening on {args.socket}")
+    daemon.serve_forever()
+
+def main(argv=None):
+    """
+    Command-line entry point.
+    
+    Args:
+        argv (list): Arguments, defaults to sys.argv[1:]
+    """
+    import argparse
+    
+    parser = argparse.ArgumentParser(prog="poly_framework",
+                                     description="Poly-AI adaptive GitHub workflow automation")
+    parser.add_argument("--profile", choices=["cpu", "mem"], default=os.getenv("POLY_PROFILE") or None,
+                        help="profile runs with cProfile or tracemalloc (default POLY_PROFILE)")
+    parser.add_argument("--profile-dir",
+                        help="directory for profile output (default POLY_PROFILE_DIR)")
+    commands = parser.add_subparsers(dest="command")
+    run = commands.add_parser("run", help="discover and rank tools, then pick a workflow (default)")
+    run.add_argument("--report", help="write a JSON run report (default POLY_METRICS_REPORT)")
+    run.add_argument("--metrics-file",
+                     help="write Prometheus text, e.g. for the node exporter textfile collector "
+                          "(default POLY_METRICS_FILE)")
+    commands.add_parser("workflow", help="print the workflow for the current environment")
+    
+    daemon = commands.add_parser("daemon", help="keep running and refresh on a schedule")
+    daemon.add_argument("--socket", help="control socket path (default POLY_DAEMON_SOCKET)")
+    daemon.add_argument("--query", default="automation", help="GitHub search query")
+    daemon.add_argument("--refresh", default="1h",
+                        help="refresh schedule: interval (30s, 15m, 1h) or cron expression")
+    daemon.add_argument("--update", default="",
+                        help="schedule for the repository update job, e.g. '0 10 * * 0'")
+    daemon.add_argument("--update-command",
+                        default=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                             "weekly_update.sh"),
+                        help="command run by the update job")
+    daemon.add_argument("--metrics-port", type=int,
+                        help="serve OpenMetrics on this local port at /metrics")
+    daemon.add_argument("--metrics-file", default=os.getenv("POLY_METRICS_FILE"),
+                        help="rewrite Prometheus text here after every job")
+    ctl = commands.add_parser("ctl", help="talk to a running daemon")
+    ctl.add_argument("request", choices=["status", "run", "top", "metrics", "stop"])
+    ctl.add_argument("job", nargs="?", default="refresh", help="job to run (default refresh)")
+    ctl.add_argument("-k", type=int, default=10, help="tools to list for top")
+    ctl.add_argument("--socket", help="control socket path (default POLY_DAEMON_SOCKET)")
+    args = parser.parse_args(argv)
+    
+    if args.command == "workflow":
+        print(pick_workflow_type(os.environ))
+        return
+    if args.command in ("daemon", "ctl"):
+        args.socket = args.socket or poly_daemon.DEFAULT_SOCKET
+    if args.command == "daemon":
+        run_daemon(args)
+        return
+    if args.command == "ctl":
+        import json
+        
+        try:
+            result = poly_daemon.send_command(args.socket, args.request, job=args.job, k=args.k)
+        except OSError:
+            sys.exit(f"daemon not running on {args.socket}")
+        print(json.dumps(result, indent=2))
+        return
+    with poly_profile.profiled(args.profile, "pipeline", args.profile_dir) as profile:
+        run_pipeline(getattr(args, "report", None), getattr(args, "metrics_file", None))
+    for path in profile.paths:
+        print(f"Profile written to {path}")
+
+if __name__ == "__main__":
+    main()
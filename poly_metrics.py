@@ -0,0 +1,329 @@
+"""
+Pipeline instrumentation and Prometheus/OpenMetrics export for the Poly-AI Framework
+"""
+import bisect
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+# Latency buckets in seconds, from a cached 304 to a slow search page
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+
+def _label_key(labelnames, labels):
+    if set(labels) != set(labelnames):
+        raise ValueError(f"Expected labels {sorted(labelnames)}, got {sorted(labels)}")
+    return tuple(str(labels[name]) for name in labelnames)
+
+
+def _format_labels(pairs):
+    if not pairs:
+        return ""
+    escaped = (
+        (name, value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'))
+        for name, value in pairs
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """
+    Monotonically increasing count, one series per label combination.
+    """
+
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames, lock):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = lock
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        """
+        Add amount to the series selected by labels.
+        """
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        with self._lock:
+            return self._values.get(_label_key(self.labelnames, labels), 0)
+
+    def snapshot(self):
+        with self._lock:
+            return {",".join(key): value for key, value in self._values.items()}
+
+    def samples(self):
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                yield f"{self.name}_total", list(zip(self.labelnames, key)), value
+
+
+class Histogram:
+    """
+    Distribution of observed values over fixed cumulative buckets.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames, lock, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._lock = lock
+        # Per series: [count per bucket (+Inf last), sum, count]
+        self._series = {}
+
+    def observe(self, value, **labels):
+        """
+        Record one observation in the series selected by labels.
+        """
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][bisect.bisect_left(self.buckets, value)] += 1
+            series[1] += value
+            series[2] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                ",".join(key): {"count": count, "sum": total,
+                                "mean": total / count if count else 0.0}
+                for key, (_, total, count) in self._series.items()
+            }
+
+    def samples(self):
+        with self._lock:
+            for key, (buckets, total, count) in sorted(self._series.items()):
+                labels = list(zip(self.labelnames, key))
+                cumulative = 0
+                for bound, hits in zip(self.buckets + (float("inf"),), buckets):
+                    cumulative += hits
+                    le = "+Inf" if bound == float("inf") else repr(float(bound))
+                    yield f"{self.name}_bucket", labels + [("le", le)], cumulative
+                yield f"{self.name}_count", labels, count
+                yield f"{self.name}_sum", labels, total
+
+
+class MetricsRegistry:
+    """
+    Collection of counters, histograms and per-stage timers.
+
+    Metrics are cumulative for the life of the registry, which is what a
+    Prometheus scrape of a long-running daemon expects; a one-shot run
+    simply reports everything it did.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+        self._stages = {}
+        self.started = time.time()
+        self.stage_seconds = self.histogram(
+            "poly_stage_seconds", "Wall time of each pipeline stage", ("stage",))
+
+    def _register(self, cls, name, documentation, labelnames, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames,
+                                                   threading.Lock(), **kwargs)
+            elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} is already registered differently")
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        """
+        Return the counter called name, creating it on first use.
+
+        Args:
+            name (str): Metric name without the _total suffix
+            documentation (str): HELP text
+            labelnames (tuple): Label names every inc() must supply
+
+        Returns:
+            Counter: Registered counter
+        """
+        return self._register(Counter, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        """
+        Return the histogram called name, creating it on first use.
+
+        Args:
+            name (str): Metric name
+            documentation (str): HELP text
+            labelnames (tuple): Label names every observe() must supply
+            buckets (tuple): Upper bucket bounds
+
+        Returns:
+            Histogram: Registered histogram
+        """
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Time a pipeline stage with the monotonic clock.
+
+        The duration is observed in poly_stage_seconds and kept as the
+        stage's last duration for the run report, even when the stage raises.
+        """
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - started
+            self.stage_seconds.observe(elapsed, stage=name)
+            with self._lock:
+                stage = self._stages.setdefault(name, {"last": 0.0, "total": 0.0, "count": 0})
+                stage["last"] = elapsed
+                stage["total"] += elapsed
+                stage["count"] += 1
+
+    def report(self):
+        """
+        Build a JSON-serialisable report of every stage and metric.
+
+        Returns:
+            dict: Stage timings, counters and histogram summaries
+        """
+        with self._lock:
+            stages = {name: dict(stage) for name, stage in self._stages.items()}
+            metrics = list(self._metrics.values())
+        return {
+            "started": self.started,
+            "uptime": time.time() - self.started,
+            "stages": stages,
+            "counters": {m.name: m.snapshot() for m in metrics if m.kind == "counter"},
+            "histograms": {m.name: m.snapshot() for m in metrics if m.kind == "histogram"},
+        }
+
+    def _exposition(self, openmetrics):
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines = []
+        for metric in metrics:
+            # The Prometheus text format names a counter family after its
+            # _total samples; OpenMetrics names it without the suffix
+            family = metric.name
+            if metric.kind == "counter" and not openmetrics:
+                family += "_total"
+            lines.append(f"# TYPE {family} {metric.kind}")
+            lines.append(f"# HELP {family} {metric.documentation}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        if openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def openmetrics(self):
+        """
+        Render every metric in the OpenMetrics text format.
+
+        Returns:
+            str: Exposition text ending in "# EOF"
+        """
+        return self._exposition(openmetrics=True)
+
+    def prometheus_text(self):
+        """
+        Render every metric in the Prometheus text format (0.0.4), which is
+        what the node exporter's textfile collector parses.
+
+        Returns:
+            str: Exposition text
+        """
+        return self._exposition(openmetrics=False)
+
+    def write_report(self, path, extra=None):
+        """
+        Write the JSON run report to path.
+
+        Args:
+            path (str): Report file
+            extra (dict): Additional top-level fields, e.g. client statistics
+        """
+        report = self.report()
+        report.update(extra or {})
+        _write_atomic(path, json.dumps(report, indent=2, sort_keys=True, default=str))
+
+    def write_textfile(self, path):
+        """
+        Write the Prometheus text to path, e.g. a node exporter textfile
+        collector directory (the file should end in .prom).
+        """
+        _write_atomic(path, self.prometheus_text())
+
+
+def _write_atomic(path, text):
+    # Write beside the target and rename so scrapers never see a partial file
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".poly-metrics-")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def serve_metrics(registry, port, host="127.0.0.1"):
+    """
+    Serve registry.openmetrics() over HTTP on a background thread.
+
+    Args:
+        registry (MetricsRegistry): Registry to expose
+        port (int): TCP port (0 picks a free one)
+        host (str): Interface to bind
+
+    Returns:
+        ThreadingHTTPServer: Running server; call shutdown() to stop it
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            body = registry.openmetrics().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", OPENMETRICS_CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="poly-metrics", daemon=True).start()
+    return server
+
+
+# Process-wide registry used by poly_framework
+METRICS = MetricsRegistry()
@@ -0,0 +1,151 @@
+"""
+CPU and memory profiling hooks for the Poly-AI Framework
+"""
+import cProfile
+import functools
+import os
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+PROFILE_MODES = ("cpu", "mem")
+
+# Frames kept per allocation traceback when profiling memory
+TRACEMALLOC_FRAMES = 10
+
+
+def default_profile_dir():
+    """
+    Return the run directory for profiles (POLY_PROFILE_DIR, default
+    ~/.cache/poly_framework/profiles).
+    """
+    return os.getenv("POLY_PROFILE_DIR") or os.path.join(
+        os.path.expanduser("~"), ".cache", "poly_framework", "profiles")
+
+
+def _profile_path(directory, name, suffix):
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    return os.path.join(directory, f"{name}-{stamp}-{os.getpid()}{suffix}")
+
+
+class Profile:
+    """
+    Outcome of a profiled block: the mode and the files it wrote.
+    """
+
+    def __init__(self, mode, name):
+        self.mode = mode
+        self.name = name
+        self.paths = []
+        self.peak_bytes = None
+
+    def __repr__(self):
+        return f"Profile({self.mode!r}, {self.name!r}, paths={self.paths!r})"
+
+
+def _write_top_allocations(snapshot, path, top, peak):
+    snapshot = snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+    ))
+    stats = snapshot.statistics("lineno")
+    total = sum(stat.size for stat in stats)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"Traced: {total / 1024:.1f} KiB in {len(stats)} locations, "
+                f"peak {peak / 1024:.1f} KiB\n")
+        for index, stat in enumerate(stats[:top], 1):
+            frame = stat.traceback[0]
+            f.write(f"#{index}: {frame.filename}:{frame.lineno}: "
+                    f"{stat.size / 1024:.1f} KiB in {stat.count} blocks\n")
+
+
+@contextmanager
+def profiled(mode, name="pipeline", directory=None, top=25):
+    """
+    Profile the enclosed block and write the results to a run directory.
+
+    "cpu" runs the block under cProfile and writes NAME-TIMESTAMP-PID.pstats
+    (open it with pstats or snakeviz); cProfile only sees the calling
+    thread, not search pages fetched on the pool. "mem" traces allocations
+    with tracemalloc and writes the raw snapshot (.tracemalloc, loadable
+    with tracemalloc.Snapshot.load) plus the top allocation sites
+    (-top.txt). A false mode makes this a no-op, so callers can pass a
+    setting through.
+
+    Example:
+        with profiled("cpu", "rank_tools"):
+            rank_tools(tools, weights, k=10)
+
+    Args:
+        mode (str): "cpu", "mem" or None
+        name (str): Prefix for the written files
+        directory (str): Run directory (default default_profile_dir())
+        top (int): Allocation sites listed in the memory summary
+
+    Yields:
+        Profile: Filled with the written paths once the block exits
+
+    Raises:
+        ValueError: If mode is not a known profile mode
+    """
+    profile = Profile(mode, name)
+    if not mode:
+        yield profile
+        return
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"Unknown profile mode {mode!r}; expected one of {PROFILE_MODES}")
+    directory = directory or default_profile_dir()
+    os.makedirs(directory, exist_ok=True)
+
+    if mode == "cpu":
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield profile
+        finally:
+            profiler.disable()
+            path = _profile_path(directory, name, ".pstats")
+            profiler.dump_stats(path)
+            profile.paths.append(path)
+        return
+
+    # Leave tracing running afterwards if an outer caller started it
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+    tracemalloc.reset_peak()
+    try:
+        yield profile
+    finally:
+        snapshot = tracemalloc.take_snapshot()
+        profile.peak_bytes = tracemalloc.get_traced_memory()[1]
+        if not was_tracing:
+            tracemalloc.stop()
+        path = _profile_path(directory, name, "")
+        snapshot.dump(path + ".tracemalloc")
+        _write_top_allocations(snapshot, path + "-top.txt", top, profile.peak_bytes)
+        profile.paths.extend([path + ".tracemalloc", path + "-top.txt"])
+
+
+def profile_calls(mode, name=None, directory=None):
+    """
+    Decorator profiling every call of a function with profiled().
+
+    Example:
+        fetch = profile_calls("mem")(fetch_github_tools)
+
+    Args:
+        mode (str): "cpu", "mem" or None
+        name (str): File prefix (default the function's name)
+        directory (str): Run directory (default default_profile_dir())
+
+    Returns:
+        callable: Decorator
+    """
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with profiled(mode, name or fn.__name__, directory):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
@@ -0,0 +1,552 @@
+"""
+Compact tool records and ranking helpers for the Poly-AI Framework
+"""
+import bisect
+import json
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+class ToolRow:
+    """
+    Lightweight view of one row of a ToolCatalog.
+
+    Supports the same item access as the tool dicts returned by
+    fetch_github_tools (tool["name"], tool["metrics"], ...), so ranking
+    output can be consumed the same way whichever representation was used.
+    """
+
+    __slots__ = ("catalog", "index")
+
+    def __init__(self, catalog, index):
+        self.catalog = catalog
+        self.index = index
+
+    @property
+    def id(self):
+        return int(self.catalog.ids[self.index])
+
+    @property
+    def name(self):
+        return self.catalog.names[self.index]
+
+    @property
+    def url(self):
+        return self.catalog.urls[self.index]
+
+    @property
+    def metrics(self):
+        return self.catalog.metrics[self.index]
+
+    def __getitem__(self, key):
+        if key not in ("id", "name", "url", "metrics"):
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __repr__(self):
+        return f"ToolRow({self.name!r}, {self.metrics.tolist()!r})"
+
+
+class ToolCatalog:
+    """
+    Column-oriented collection of tools.
+
+    Metrics live in one contiguous float64 matrix (tools x metrics) and
+    ids, names and URLs in parallel arrays with interned strings, instead
+    of one dict and one metric list per tool. rank_tools scores the matrix
+    directly, without rebuilding it on every call.
+    """
+
+    __slots__ = ("ids", "names", "urls", "metrics")
+
+    def __init__(self, ids, names, urls, metrics):
+        """
+        Args:
+            ids (array-like): Repository ids
+            names (array-like): Repository full names
+            urls (array-like): Repository URLs
+            metrics (array-like): Metric matrix with one row per tool
+        """
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.names = np.array([sys.intern(str(n)) for n in names], dtype=object)
+        self.urls = np.array([sys.intern(str(u)) for u in urls], dtype=object)
+        self.metrics = np.ascontiguousarray(metrics, dtype=np.float64)
+        if self.metrics.ndim != 2:
+            # An empty catalog has no row to infer the width from
+            self.metrics = self.metrics.reshape(len(self.ids), -1 if len(self.ids) else 0)
+        if not len(self.ids) == len(self.names) == len(self.urls) == len(self.metrics):
+            raise ValueError("ids, names, urls and metrics must have the same length")
+
+    @classmethod
+    def from_tools(cls, tools):
+        """
+        Build a catalog from tool dicts as returned by fetch_github_tools.
+
+        Args:
+            tools (iterable): Tool dicts with id, name, url and metrics
+
+        Returns:
+            ToolCatalog: Compact copy of the tools
+        """
+        tools = list(tools)
+        return cls(
+            [t.get("id", i) for i, t in enumerate(tools)],
+            [t["name"] for t in tools],
+            [t["url"] for t in tools],
+            [t["metrics"] for t in tools],
+        )
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return ToolRow(self, index)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield ToolRow(self, i)
+
+    def to_tools(self):
+        """
+        Expand the catalog back into tool dicts.
+
+        Returns:
+            list: Tools in the layout fetch_github_tools produces
+        """
+        return [
+            {"id": int(i), "name": n, "metrics": m.tolist(), "url": u}
+            for i, n, u, m in zip(self.ids, self.names, self.urls, self.metrics)
+        ]
+
+
+def _top_candidates(scores, k):
+    # Indices of the k highest scores in one column, in ascending order.
+    # argpartition breaks ties at the cut-off arbitrarily; hand them to the
+    # lowest indices instead, as a stable full sort would.
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    selected = scores[candidates]
+    cutoff = selected.min()
+    tied = np.flatnonzero(scores == cutoff)
+    if len(tied) > np.count_nonzero(selected == cutoff):
+        above = candidates[selected > cutoff]
+        candidates = np.concatenate([above, tied[:k - len(above)]])
+    return np.sort(candidates)
+
+
+def top_k(scores, k):
+    """
+    Select the k highest scores with a partial sort.
+
+    np.argpartition finds the top k in linear time and only that slice is
+    sorted, instead of sorting every score. Ties keep catalog order, so
+    the result is a prefix of the full ranking.
+
+    Args:
+        scores (np.ndarray): One score per tool
+        k (int): Number of entries to select
+
+    Returns:
+        tuple: (indices, scores) arrays, best first
+    """
+    scores = np.asarray(scores)
+    k = max(0, min(k, len(scores)))
+    if k == 0:
+        return np.empty(0, dtype=np.intp), scores[:0]
+    if k < len(scores):
+        candidates = _top_candidates(scores, k)
+    else:
+        candidates = np.arange(len(scores))
+    order = candidates[np.argsort(-scores[candidates], kind="stable")]
+    return order, scores[order]
+
+
+def top_k_batched(scores, k):
+    """
+    Select the k highest scores in every column of a score matrix.
+
+    Args:
+        scores (np.ndarray): Scores shaped (tools, profiles)
+        k (int): Number of entries to select per profile
+
+    Returns:
+        tuple: (indices, scores) arrays shaped (profiles, k), best first
+    """
+    scores = np.asarray(scores)
+    n = scores.shape[0]
+    k = max(0, min(k, n))
+    if k == 0:
+        return (np.empty((scores.shape[1], 0), dtype=np.intp),
+                np.empty((scores.shape[1], 0), dtype=scores.dtype))
+    if k < n:
+        candidates = np.stack([_top_candidates(column, k) for column in scores.T], axis=1)
+    else:
+        candidates = np.broadcast_to(np.arange(n)[:, None], scores.shape)
+    selected = np.take_along_axis(scores, candidates, axis=0)
+    order = np.argsort(-selected, axis=0, kind="stable")
+    indices = np.take_along_axis(candidates, order, axis=0)
+    return indices.T, np.take_along_axis(selected, order, axis=0).T
+
+
+class RankingIndex:
+    """
+    Ranking that is kept up to date as individual tools change.
+
+    Scores are stored per tool id next to an ordering kept sorted by score,
+    so applying a metric delta re-scores only the changed tools (one dot
+    product and one bisect each) and top-k queries read the head of the
+    ordering without recomputing anything.
+    """
+
+    def __init__(self, weights, tools=()):
+        """
+        Args:
+            weights (list): Weights for each metric
+            tools (iterable): Initial tools (dicts or ToolCatalog rows)
+        """
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self._tools = {}
+        self._metrics = {}
+        self._scores = {}
+        # Sorted (-score, id) keys: best first, ties broken by id
+        self._order = []
+        self.add(tools)
+
+    def __len__(self):
+        return len(self._order)
+
+    def __contains__(self, tool_id):
+        return tool_id in self._scores
+
+    def add(self, tools):
+        """
+        Add or replace tools.
+
+        Tools already in the index are re-scored in place (one bisect each,
+        and only when their score changed), so a refresh that mostly
+        re-reports known tools does not re-sort the whole ordering. New
+        ids are inserted together.
+
+        Args:
+            tools (iterable): Tools (dicts or ToolCatalog rows)
+        """
+        tools = list(tools)
+        if not tools:
+            return
+        matrix = np.array([t["metrics"] for t in tools], dtype=np.float64)
+        scores = matrix @ self.weights
+        added = {}
+        for tool, metrics, score in zip(tools, matrix, scores):
+            tool_id = int(tool["id"])
+            self._tools[tool_id] = {"id": tool_id, "name": tool["name"], "url": tool["url"]}
+            if tool_id in self._scores and tool_id not in added:
+                if self._scores[tool_id] != score:
+                    self._rescore(tool_id, metrics, score)
+                else:
+                    self._metrics[tool_id] = metrics
+                continue
+            self._metrics[tool_id] = metrics
+            self._scores[tool_id] = float(score)
+            added[tool_id] = (-float(score), tool_id)
+        # A few insertions are cheaper than re-sorting everything
+        if len(added) <= len(self._order) // 8:
+            for key in added.values():
+                bisect.insort(self._order, key)
+        else:
+            self._order.extend(added.values())
+            self._order.sort()
+
+    def remove(self, tool_id):
+        """
+        Drop a tool from the index.
+        """
+        score = self._scores.pop(tool_id)
+        del self._order[bisect.bisect_left(self._order, (-score, tool_id))]
+        del self._tools[tool_id]
+        del self._metrics[tool_id]
+
+    def _rescore(self, tool_id, metrics, score=None):
+        old = (-self._scores[tool_id], tool_id)
+        del self._order[bisect.bisect_left(self._order, old)]
+        score = float(metrics @ self.weights if score is None else score)
+        self._metrics[tool_id] = metrics
+        self._scores[tool_id] = score
+        bisect.insort(self._order, (-score, tool_id))
+
+    def apply_deltas(self, deltas):
+        """
+        Add metric deltas to existing tools and re-rank only those tools.
+
+        Args:
+            deltas (dict): Tool id -> per-metric delta (e.g. new stars)
+        """
+        for tool_id, delta in deltas.items():
+            self._rescore(tool_id, self._metrics[tool_id] + np.asarray(delta, dtype=np.float64))
+
+    def set_metrics(self, updates):
+        """
+        Replace the metrics of existing tools and re-rank only those tools.
+
+        Args:
+            updates (dict): Tool id -> new metric vector
+        """
+        for tool_id, metrics in updates.items():
+            self._rescore(tool_id, np.asarray(metrics, dtype=np.float64))
+
+    def score(self, tool_id):
+        return self._scores[tool_id]
+
+    def top(self, k=10):
+        """
+        Return the current k best tools.
+
+        Args:
+            k (int): Number of tools to return
+
+        Returns:
+            list: (tool, score) pairs, best first, in the rank_tools layout
+        """
+        return [
+            (dict(self._tools[tool_id], metrics=self._metrics[tool_id].tolist()), -neg_score)
+            for neg_score, tool_id in self._order[:k]
+        ]
+
+
+class MetricMatrix:
+    """
+    Metric matrix stored on disk and read through np.memmap.
+
+    The format is a raw little-endian float64 file holding the matrix row
+    by row, an optional raw int64 file of tool ids (``<path>.ids``) and a
+    JSON header (``<path>.json``) recording the shape. Ranking reads it in
+    fixed-size chunks, so memory is bounded by the chunk size rather than
+    the number of rows.
+    """
+
+    DTYPE = np.dtype("<f8")
+    ID_DTYPE = np.dtype("<i8")
+
+    def __init__(self, path):
+        """
+        Open an on-disk metric matrix read-only.
+
+        Args:
+            path (str): Matrix data file written by MetricMatrixWriter
+        """
+        with open(path + ".json", encoding="utf-8") as f:
+            header = json.load(f)
+        self.path = path
+        self.rows = header["rows"]
+        self.width = header["width"]
+        self.metrics = (np.memmap(path, dtype=self.DTYPE, mode="r", shape=(self.rows, self.width))
+                        if self.rows else np.empty((0, self.width), dtype=self.DTYPE))
+        self.ids = None
+        if header.get("ids") and self.rows:
+            self.ids = np.memmap(path + ".ids", dtype=self.ID_DTYPE, mode="r", shape=(self.rows,))
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, index):
+        tool_id = int(self.ids[index]) if self.ids is not None else int(index)
+        return {"id": tool_id, "metrics": self.metrics[index].tolist()}
+
+    def chunks(self, chunk_rows):
+        """
+        Yield (start, block) pairs covering the matrix chunk_rows at a time.
+        """
+        for start in range(0, self.rows, chunk_rows):
+            yield start, np.asarray(self.metrics[start:start + chunk_rows])
+
+
+class MetricMatrixWriter:
+    """
+    Streams metric rows into the on-disk MetricMatrix format.
+    """
+
+    def __init__(self, path, width, with_ids=True):
+        """
+        Args:
+            path (str): Matrix data file to create
+            width (int): Number of metrics per row
+            with_ids (bool): Also write a tool id per row
+        """
+        self.path = path
+        self.width = width
+        self.rows = 0
+        self._data = open(path, "wb")
+        self._ids = open(path + ".ids", "wb") if with_ids else None
+
+    def append(self, metrics, ids=None):
+        """
+        Append a block of rows.
+
+        Args:
+            metrics (array-like): Rows shaped (n, width)
+            ids (array-like): Tool id per row, required when writing ids
+        """
+        block = np.asarray(metrics, dtype=MetricMatrix.DTYPE).reshape(-1, self.width)
+        self._data.write(np.ascontiguousarray(block).tobytes())
+        if self._ids is not None:
+            id_block = np.asarray(ids, dtype=MetricMatrix.ID_DTYPE)
+            if len(id_block) != len(block):
+                raise ValueError("ids must have one entry per metric row")
+            self._ids.write(id_block.tobytes())
+        self.rows += len(block)
+
+    def close(self):
+        self._data.close()
+        if self._ids is not None:
+            self._ids.close()
+        with open(self.path + ".json", "w", encoding="utf-8") as f:
+            json.dump({"rows": self.rows, "width": self.width, "dtype": MetricMatrix.DTYPE.str,
+                       "ids": self._ids is not None}, f)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def top_k_chunked(chunks, weights, k):
+    """
+    Score a matrix chunk by chunk and merge per-chunk top-k results.
+
+    Args:
+        chunks (iterable): (start row, metric block) pairs
+        weights (np.ndarray): Weight vector, or (profiles x metrics) matrix
+        k (int): Number of entries to select (per profile)
+
+    Returns:
+        tuple: (indices, scores) of the global top k, shaped like top_k or
+        top_k_batched depending on the weights
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    matrix_weights = np.atleast_2d(weights)
+    profiles = matrix_weights.shape[0]
+    best_idx = np.empty((profiles, 0), dtype=np.intp)
+    best_scores = np.empty((profiles, 0), dtype=np.float64)
+    for start, block in chunks:
+        idx, scores = top_k_batched(block @ matrix_weights.T, k)
+        # Merge this chunk's winners with the running winners
+        cand_idx = np.concatenate([best_idx, idx + start], axis=1)
+        cand_scores = np.concatenate([best_scores, scores], axis=1)
+        sel, best_scores = top_k_batched(cand_scores.T, k)
+        best_idx = np.take_along_axis(cand_idx, sel, axis=1)
+    if weights.ndim == 1:
+        return best_idx[0], best_scores[0]
+    return best_idx, best_scores
+
+
+def _attach(source, shape):
+    # Map the shared matrix into this process without copying it
+    kind, name = source
+    if kind == "file":
+        return None, np.memmap(name, dtype=MetricMatrix.DTYPE, mode="r", shape=shape)
+    # Workers share the parent's resource tracker, which already tracks
+    # the segment, so attaching here does not take ownership of it
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=MetricMatrix.DTYPE, buffer=shm.buf)
+
+
+def _rank_shard(source, shape, start, stop, weights, k, chunk_rows):
+    shm, matrix = _attach(source, shape)
+    try:
+        chunks = ((s, matrix[s:min(s + chunk_rows, stop)]) for s in range(start, stop, chunk_rows))
+        idx, scores = top_k_chunked(chunks, weights, k)
+        return np.atleast_2d(idx).copy(), np.atleast_2d(scores).copy()
+    finally:
+        del matrix
+        if shm is not None:
+            shm.close()
+
+
+class ShardedRanker:
+    """
+    Ranks a metric matrix across a pool of worker processes.
+
+    The matrix is shared rather than copied: an on-disk MetricMatrix is
+    memory-mapped by every worker, and an in-memory matrix is placed once
+    in a shared memory segment. Each worker scores one contiguous shard in
+    chunks and returns its local top-k; the parent merges them.
+    """
+
+    def __init__(self, processes=None, chunk_rows=1 << 18):
+        """
+        Args:
+            processes (int): Worker processes, defaults to the CPU count
+            chunk_rows (int): Rows scored per block inside each worker
+        """
+        self.processes = processes or os.cpu_count() or 1
+        self.chunk_rows = chunk_rows
+        self._pool = ProcessPoolExecutor(max_workers=self.processes,
+                                         mp_context=multiprocessing.get_context("spawn"))
+
+    def top_k(self, matrix, weights, k):
+        """
+        Select the k best rows of a matrix using every worker.
+
+        Args:
+            matrix: MetricMatrix or 2-D array of metrics
+            weights (np.ndarray): Weight vector, or (profiles x metrics) matrix
+            k (int): Number of rows to select (per profile)
+
+        Returns:
+            tuple: (indices, scores), shaped like top_k or top_k_batched
+        """
+        weights = np.asarray(weights, dtype=np.float64)
+        shm = None
+        if isinstance(matrix, MetricMatrix):
+            rows, shape, source = matrix.rows, (matrix.rows, matrix.width), ("file", matrix.path)
+        else:
+            data = np.asarray(matrix, dtype=MetricMatrix.DTYPE)
+            rows, shape = len(data), data.shape
+            shm = shared_memory.SharedMemory(create=True, size=max(1, data.nbytes))
+            np.ndarray(shape, dtype=data.dtype, buffer=shm.buf)[:] = data
+            source = ("shm", shm.name)
+        try:
+            if rows == 0:
+                return top_k_chunked(iter(()), weights, k)
+            shard = -(-rows // self.processes)
+            futures = [
+                self._pool.submit(_rank_shard, source, shape, start, min(start + shard, rows),
+                                  weights, k, self.chunk_rows)
+                for start in range(0, rows, shard)
+            ]
+            results = [f.result() for f in futures]
+        finally:
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+        # Every shard already holds global row indices
+        cand_idx = np.concatenate([idx for idx, _ in results], axis=1)
+        cand_scores = np.concatenate([scores for _, scores in results], axis=1)
+        sel, best_scores = top_k_batched(cand_scores.T, k)
+        best_idx = np.take_along_axis(cand_idx, sel, axis=1)
+        if weights.ndim == 1:
+            return best_idx[0], best_scores[0]
+        return best_idx, best_scores
+
+    def close(self):
+        self._pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
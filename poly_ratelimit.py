@@ -0,0 +1,205 @@
+"""
+Rate-limit-aware request scheduling for the GitHub API
+"""
+import threading
+import time
+
+# Primary limits per token as (requests, period in seconds)
+RESOURCE_LIMITS = {
+    "search": (30, 60),
+    "core": (5000, 3600),
+    "graphql": (5000, 3600),
+}
+
+# Seconds to back off after a secondary rate limit that sends no Retry-After
+SECONDARY_LIMIT_WAIT = 60
+
+# Limits applied when no token is configured
+ANONYMOUS_LIMITS = {
+    "search": (10, 60),
+    "core": (60, 3600),
+    "graphql": (0, 3600),
+}
+
+
+class TokenBucket:
+    """
+    Token bucket pacing requests to a steady rate with bounded bursts.
+    """
+
+    def __init__(self, rate, capacity):
+        """
+        Args:
+            rate (float): Tokens added per second
+            capacity (float): Maximum number of stored tokens
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, now):
+        """
+        Return seconds until one token is available.
+        """
+        self._refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        if self.rate <= 0:
+            return float("inf")
+        return (1 - self.tokens) / self.rate
+
+    def take(self, now):
+        """
+        Consume one token; the caller must have checked wait_time first.
+        """
+        self._refill(now)
+        self.tokens -= 1
+
+
+class _Budget:
+    def __init__(self, token, resource, limits):
+        requests_per_period, period = limits[resource]
+        self.token = token
+        self.remaining = requests_per_period
+        self.blocked_until = 0.0 if requests_per_period else float("inf")
+        self.bucket = TokenBucket(
+            requests_per_period / period,
+            max(1.0, requests_per_period * 60 / period),
+        )
+
+
+class RateLimitScheduler:
+    """
+    Shared scheduler rotating several GitHub tokens.
+
+    Each (token, resource) pair has a token bucket pacing it to its primary
+    limit and a budget refreshed from X-RateLimit-Remaining and
+    X-RateLimit-Reset. Callers acquire() a token before each request and
+    report the response back through update(). Exhausted tokens and tokens
+    told to back off by a secondary limit's Retry-After are skipped until
+    they recover; when every token is blocked, acquire() sleeps.
+    """
+
+    def __init__(self, tokens, limits=None):
+        """
+        Args:
+            tokens (list): GitHub tokens; an empty list schedules anonymous calls
+            limits (dict): Per-resource (requests, period) limits overriding
+                RESOURCE_LIMITS / ANONYMOUS_LIMITS
+        """
+        tokens = [t for t in tokens if t] or [None]
+        if limits is None:
+            limits = ANONYMOUS_LIMITS if tokens == [None] else RESOURCE_LIMITS
+        self._budgets = {
+            resource: [_Budget(token, resource, limits) for token in tokens]
+            for resource in limits
+        }
+        self._lock = threading.Lock()
+        self.waits = 0
+        self.throttled = 0
+
+    @property
+    def tokens(self):
+        return [b.token for b in self._budgets["core"]]
+
+    def _wall_to_monotonic(self, epoch):
+        return time.monotonic() + max(0.0, epoch - time.time())
+
+    def acquire(self, resource="core"):
+        """
+        Block until a token may issue a request against resource.
+
+        Args:
+            resource (str): Rate-limit resource ("core", "search" or "graphql")
+
+        Returns:
+            str: Token to authenticate with, or None for anonymous access
+        """
+        budgets = self._budgets[resource]
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                best, best_wait = None, float("inf")
+                for budget in budgets:
+                    wait = max(budget.blocked_until - now, budget.bucket.wait_time(now))
+                    if wait < best_wait or (wait == best_wait and best is not None
+                                            and budget.remaining > best.remaining):
+                        best, best_wait = budget, wait
+                if best_wait <= 0:
+                    best.bucket.take(now)
+                    best.remaining = max(0, best.remaining - 1)
+                    return best.token
+                self.waits += 1
+            if best_wait == float("inf"):
+                raise RuntimeError(f"No token can access the {resource} API")
+            time.sleep(best_wait)
+
+    def update(self, token, resource, response):
+        """
+        Record rate-limit headers from a response.
+
+        Args:
+            token (str): Token the request was made with
+            resource (str): Resource the token was acquired for
+            response (requests.Response): Response to inspect
+
+        Returns:
+            bool: True if the request was rejected by a rate limit and
+            should be retried
+        """
+        headers = response.headers
+        resource = headers.get("X-RateLimit-Resource", resource)
+        if resource not in self._budgets:
+            return False
+        secondary = (response.status_code in (403, 429)
+                     and "secondary rate limit" in response.text.lower())
+        with self._lock:
+            budget = next((b for b in self._budgets[resource] if b.token == token), None)
+            if budget is None:
+                return False
+            remaining = headers.get("X-RateLimit-Remaining")
+            reset = headers.get("X-RateLimit-Reset")
+            if remaining is not None:
+                budget.remaining = int(remaining)
+            if budget.remaining == 0 and reset is not None:
+                budget.blocked_until = max(budget.blocked_until,
+                                           self._wall_to_monotonic(int(reset)))
+
+            if response.status_code not in (403, 429):
+                return False
+            retry_after = headers.get("Retry-After")
+            if retry_after is not None:
+                budget.blocked_until = max(budget.blocked_until,
+                                           time.monotonic() + int(retry_after))
+            elif secondary:
+                # GitHub asks for at least a minute when it gives no Retry-After
+                budget.blocked_until = max(budget.blocked_until,
+                                           time.monotonic() + SECONDARY_LIMIT_WAIT)
+            elif remaining != "0":
+                # Forbidden for a reason other than rate limiting
+                return False
+            self.throttled += 1
+            return True
+
+    def stats(self):
+        """
+        Return per-resource budgets and scheduler counters.
+
+        Returns:
+            dict: Remaining budget per token and resource, plus wait and
+            throttle counts
+        """
+        with self._lock:
+            return {
+                "waits": self.waits,
+                "throttled": self.throttled,
+                "remaining": {
+                    resource: [b.remaining for b in budgets]
+                    for resource, budgets in self._budgets.items()
+                },
+            }
@@ -0,0 +1,179 @@
+"""
+Bounded-latency failure handling for external recommendation sources
+"""
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a call is rejected because its circuit is open."""
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a call does not finish within its deadline."""
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker failing fast after repeated errors.
+
+    After failure_threshold consecutive failures the circuit opens and
+    calls are rejected for reset_timeout seconds. The next call after the
+    cool-down is let through as a trial (half-open): success closes the
+    circuit, failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=60.0):
+        """
+        Args:
+            name (str): Name of the protected dependency
+            failure_threshold (int): Consecutive failures that open the circuit
+            reset_timeout (float): Seconds to stay open before a trial call
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+        self.rejected = 0
+        self.trips = 0
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def before_call(self):
+        """
+        Admit or reject a call.
+
+        Raises:
+            CircuitOpenError: If the circuit is open or a trial is in flight
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+            cooled = time.monotonic() - self._opened_at >= self.reset_timeout
+            if cooled and not self._trial_in_flight:
+                self._state = self.HALF_OPEN
+                self._trial_in_flight = True
+                return
+            self.rejected += 1
+        raise CircuitOpenError(f"Circuit for {self.name} is open")
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self.trips += 1
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def stats(self):
+        """
+        Return the breaker's observable state.
+
+        Returns:
+            dict: State, consecutive failures, trips, rejected calls and
+            seconds until a trial call is allowed
+        """
+        state = self.state
+        with self._lock:
+            retry_in = 0.0
+            if self._state == self.OPEN:
+                retry_in = max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+            return {
+                "name": self.name,
+                "state": state,
+                "failures": self._failures,
+                "trips": self.trips,
+                "rejected": self.rejected,
+                "retry_in": retry_in,
+            }
+
+
+# Worker threads that enforce deadlines; a call that overruns is abandoned
+# and its thread finishes on its own once the call's own timeout fires.
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="poly-deadline")
+
+
+def _run_with_deadline(fn, remaining):
+    future = _executor.submit(fn, remaining)
+    try:
+        return future.result(timeout=remaining)
+    except FutureTimeoutError:
+        future.cancel()
+        raise DeadlineExceeded(f"Call did not finish within {remaining:.2f}s") from None
+
+
+def resilient_call(fn, breaker, deadline=10.0, attempts=3, base_delay=0.2, max_delay=2.0,
+                   retry_on=(Exception,)):
+    """
+    Call fn under a deadline with jittered retries and a circuit breaker.
+
+    Args:
+        fn (callable): Function taking the remaining time budget in seconds,
+            which it should pass on as its own I/O timeout
+        breaker (CircuitBreaker): Breaker guarding the dependency
+        deadline (float): Total seconds allowed across all attempts
+        attempts (int): Maximum number of attempts
+        base_delay (float): Base back-off before the second attempt
+        max_delay (float): Upper bound on any single back-off
+        retry_on (tuple): Exception types worth retrying
+
+    Returns:
+        The result of fn
+
+    Raises:
+        CircuitOpenError: If the breaker rejects the call
+        DeadlineExceeded: If the deadline runs out
+        Exception: The last error raised by fn
+    """
+    breaker.before_call()
+    end = time.monotonic() + deadline
+    error = None
+    for attempt in range(attempts):
+        remaining = end - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            result = _run_with_deadline(fn, remaining)
+        except Exception as e:
+            error = e
+        else:
+            breaker.record_success()
+            return result
+        # Every failed attempt counts, and retrying stops once the circuit opens
+        breaker.record_failure()
+        if (isinstance(error, DeadlineExceeded) or not isinstance(error, retry_on)
+                or attempt == attempts - 1 or breaker.state == breaker.OPEN):
+            break
+        # Full jitter: sleep a random share of the exponential back-off
+        delay = random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+        if time.monotonic() + delay >= end:
+            break
+        time.sleep(delay)
+    if error is None:
+        breaker.record_failure()
+        raise DeadlineExceeded(f"Call did not finish within {deadline:.2f}s")
+    raise error
@@ -0,0 +1,174 @@
+"""
+Persistent SQLite store of discovered tools for the Poly-AI Framework
+"""
+import json
+import sqlite3
+import threading
+import time
+
+from poly_ranking import ToolCatalog
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tools (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    url TEXT NOT NULL,
+    metrics TEXT NOT NULL,
+    pushed_at TEXT,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS metric_history (
+    tool_id INTEGER NOT NULL REFERENCES tools(id),
+    recorded_at REAL NOT NULL,
+    metrics TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS metric_history_tool ON metric_history(tool_id, recorded_at);
+CREATE TABLE IF NOT EXISTS sync_cursors (
+    query TEXT PRIMARY KEY,
+    synced_at TEXT NOT NULL
+);
+"""
+
+
+class ToolStore:
+    """
+    Local store of discovered repositories and their metric history.
+
+    Tools are keyed on repository id. A metric history row is written only
+    when a tool's metrics change, and a per-query cursor records when each
+    discovery query was last synced so refreshes can ask GitHub only for
+    repositories pushed since then.
+    """
+
+    def __init__(self, path):
+        """
+        Open (or create) a store database.
+
+        Args:
+            path (str): SQLite database file, or ":memory:"
+        """
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def upsert(self, tools):
+        """
+        Insert or update tools, recording metric history on change.
+
+        Args:
+            tools (list): Tools as returned by fetch_github_tools
+
+        Returns:
+            int: Number of tools that were new or whose metrics changed
+        """
+        now = time.time()
+        changed = 0
+        with self._lock, self._conn:
+            for tool in tools:
+                metrics = json.dumps(tool["metrics"])
+                row = self._conn.execute(
+                    "SELECT metrics FROM tools WHERE id = ?", (tool["id"],)
+                ).fetchone()
+                if row is None:
+                    self._conn.execute(
+                        "INSERT INTO tools VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (tool["id"], tool["name"], tool["url"], metrics,
+                         tool.get("pushed_at"), now, now),
+                    )
+                else:
+                    self._conn.execute(
+                        "UPDATE tools SET name = ?, url = ?, metrics = ?, pushed_at = ?, "
+                        "last_seen = ? WHERE id = ?",
+                        (tool["name"], tool["url"], metrics, tool.get("pushed_at"),
+                         now, tool["id"]),
+                    )
+                if row is None or row[0] != metrics:
+                    self._conn.execute(
+                        "INSERT INTO metric_history VALUES (?, ?, ?)",
+                        (tool["id"], now, metrics),
+                    )
+                    changed += 1
+        return changed
+
+    def cursor(self, query):
+        """
+        Return the timestamp a query was last synced at.
+
+        Args:
+            query (str): Discovery query
+
+        Returns:
+            str: ISO 8601 UTC timestamp, or None if never synced
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT synced_at FROM sync_cursors WHERE query = ?", (query,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_cursor(self, query, synced_at):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_cursors VALUES (?, ?)", (query, synced_at)
+            )
+
+    def history(self, tool_id):
+        """
+        Return the recorded metric history of one tool.
+
+        Args:
+            tool_id (int): Repository id
+
+        Returns:
+            list: (timestamp, metrics) pairs, oldest first
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT recorded_at, metrics FROM metric_history WHERE tool_id = ? "
+                "ORDER BY recorded_at", (tool_id,)
+            ).fetchall()
+        return [(recorded_at, json.loads(metrics)) for recorded_at, metrics in rows]
+
+    def tools(self):
+        """
+        Return every stored tool.
+
+        Returns:
+            list: Tools in the same layout fetch_github_tools produces
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, name, url, metrics, pushed_at FROM tools ORDER BY id"
+            ).fetchall()
+        return [
+            {"id": id_, "name": name, "url": url, "metrics": json.loads(metrics),
+             "pushed_at": pushed_at}
+            for id_, name, url, metrics, pushed_at in rows
+        ]
+
+    def to_catalog(self):
+        """
+        Read every stored tool straight into a compact ToolCatalog.
+
+        Returns:
+            ToolCatalog: Stored tools with their ranking matrix
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, name, url, metrics FROM tools ORDER BY id"
+            ).fetchall()
+        return ToolCatalog(
+            [r[0] for r in rows],
+            [r[1] for r in rows],
+            [r[2] for r in rows],
+            [json.loads(r[3]) for r in rows],
+        )
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM tools").fetchone()[0]
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,464 @@
+"""
+Parallel multi-repository sync engine for githubupdater
+
+Reads a repository list (one working tree per line, as in the repo_list.txt
+used by manage_repos.sh), then checks status, stages, commits and pushes
+each repository on a bounded worker pool and prints a per-repository table
+with timings and git exit codes.
+
+List format, relative paths being resolved against the list's directory:
+
+    # path                           [branch=..] [remote=..] [add=a,b] [message=..]
+    sentiment-analysis-project
+    .                                add=README.md message="Weekly profile update: {date}"
+
+With --status it instead scans the fleet's `git status` concurrently,
+caching each result against the repository's index and HEAD so repeated
+scans of an unchanged fleet do not run git at all.
+
+Usage:
+    python poly_sync.py [repo_list.txt] [--jobs N] [--dry-run] [--no-push]
+    python poly_sync.py [repo_list.txt] --status [--max-age S] [--no-cache]
+"""
+import argparse
+import json
+import os
+import shlex
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+DEFAULT_MESSAGE = "Weekly update: {date} - Improvements and bug fixes"
+DEFAULT_REMOTE = "origin"
+
+# Seconds a single git command may run before the repository is failed
+GIT_TIMEOUT = 300
+
+# Never block a worker on an interactive credential prompt
+GIT_ENV = {"GIT_TERMINAL_PROMPT": "0", "GIT_ASKPASS": "true", "LC_ALL": "C"}
+
+STATUS_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "poly_framework",
+                            "fleet_status.json")
+
+# Edits to tracked files that have not touched the index are invisible to
+# the cache key, so cached results are also bounded in age
+STATUS_MAX_AGE = 60.0
+
+
+def load_repo_list(path):
+    """
+    Parse a repository list file.
+
+    Args:
+        path (str): List file
+
+    Returns:
+        list: Repository specs (dicts with name, path, branch, remote, add
+        and message), in file order
+
+    Raises:
+        ValueError: If a line carries an unknown option
+    """
+    base = os.path.dirname(os.path.abspath(path))
+    repos = []
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            fields = shlex.split(line, comments=True)
+            if not fields:
+                continue
+            repo_path = os.path.normpath(os.path.join(base, os.path.expanduser(fields[0])))
+            spec = {"name": os.path.basename(repo_path), "path": repo_path, "branch": None,
+                    "remote": DEFAULT_REMOTE, "add": ["."], "message": None}
+            for option in fields[1:]:
+                key, _, value = option.partition("=")
+                if key not in ("name", "branch", "remote", "add", "message") or not value:
+                    raise ValueError(f"{path}:{number}: unknown option {option!r}")
+                spec[key] = value.split(",") if key == "add" else value
+            repos.append(spec)
+    return repos
+
+
+def _git(repo_path, *args, timeout=GIT_TIMEOUT):
+    env = dict(os.environ, **GIT_ENV)
+    try:
+        proc = subprocess.run(["git", "-C", repo_path, *args], capture_output=True, text=True,
+                              env=env, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return 124, "", f"git timed out after {timeout}s"
+    return proc.returncode, proc.stdout, proc.stderr
+
+
+def parse_status(output):
+    """
+    Parse `git status --porcelain=v2 --branch` output.
+
+    Args:
+        output (str): Command output
+
+    Returns:
+        dict: branch (None when detached), upstream, ahead, behind and the
+        number of changed and untracked entries
+    """
+    status = {"branch": None, "upstream": None, "ahead": 0, "behind": 0,
+              "changed": 0, "untracked": 0}
+    for line in output.splitlines():
+        if line.startswith("# branch.head "):
+            head = line[len("# branch.head "):]
+            status["branch"] = None if head == "(detached)" else head
+        elif line.startswith("# branch.upstream "):
+            status["upstream"] = line[len("# branch.upstream "):]
+        elif line.startswith("# branch.ab "):
+            ahead, behind = line[len("# branch.ab "):].split()
+            status["ahead"], status["behind"] = int(ahead), -int(behind)
+        elif line.startswith("? "):
+            status["untracked"] += 1
+        elif line and line[0] in "12u":
+            status["changed"] += 1
+    return status
+
+
+def sync_repo(spec, message=DEFAULT_MESSAGE, push=True, dry_run=False, timeout=GIT_TIMEOUT):
+    """
+    Commit and push one repository.
+
+    Args:
+        spec (dict): Repository spec from load_repo_list
+        message (str): Commit message template; {date} and {name} are filled in
+        push (bool): Push after committing (and push commits already ahead)
+        dry_run (bool): Only report status
+        timeout (float): Seconds allowed per git command
+
+    Returns:
+        dict: name, path, result, exit code of the last git command,
+        seconds taken and a short detail line
+    """
+    started = time.monotonic()
+    result = {"name": spec["name"], "path": spec["path"], "result": "error", "exit_code": 0,
+              "seconds": 0.0, "detail": ""}
+
+    def finish(outcome, code=0, detail=""):
+        lines = detail.strip().splitlines()
+        result.update(result=outcome, exit_code=code, detail=lines[-1] if lines else "",
+                      seconds=time.monotonic() - started)
+        return result
+
+    if not os.path.isdir(spec["path"]):
+        return finish("missing", 1, "directory not found")
+    code, out, err = _git(spec["path"], "status", "--porcelain=v2", "--branch", timeout=timeout)
+    if code:
+        return finish("error", code, err)
+    status = parse_status(out)
+    dirty = status["changed"] + status["untracked"]
+    branch = status["branch"]
+    if spec["branch"] and spec["branch"] != branch:
+        # Never commit to, or push, a branch other than the one listed
+        return finish("wrong branch", 1, f"on {branch or 'detached HEAD'}, "
+                                         f"expected {spec['branch']}")
+    if dry_run:
+        return finish("dirty" if dirty else "clean", 0,
+                      f"{dirty} changes, {status['ahead']} ahead, {status['behind']} behind")
+
+    committed = False
+    if dirty:
+        code, _, err = _git(spec["path"], "add", "--", *spec["add"], timeout=timeout)
+        if code:
+            return finish("error", code, err)
+        # Exit status 1 means something is staged; 0 means the add
+        # pathspecs did not cover any of the changes
+        code, _, err = _git(spec["path"], "diff", "--cached", "--quiet", timeout=timeout)
+        if code > 1:
+            return finish("error", code, err)
+        if code == 1:
+            text = (spec["message"] or message).format(date=date.today().isoformat(),
+                                                       name=spec["name"])
+            code, out, err = _git(spec["path"], "commit", "-q", "-m", text, timeout=timeout)
+            if code:
+                return finish("error", code, err or out)
+            committed = True
+
+    if not push or branch is None:
+        outcome = "committed" if committed else "clean"
+        return finish(outcome, 0, "" if branch else "detached HEAD, not pushed")
+    if not committed and status["upstream"] and not status["ahead"]:
+        return finish("clean")
+    # Set the upstream only on the first push of a branch
+    track = [] if status["upstream"] else ["-u"]
+    code, out, err = _git(spec["path"], "push", "-q", *track, spec["remote"],
+                          f"refs/heads/{branch}:refs/heads/{branch}", timeout=timeout)
+    if code:
+        return finish("push failed", code, err)
+    return finish("pushed", 0, f"{spec['remote']}/{branch}")
+
+
+def sync_repos(specs, jobs=8, **kwargs):
+    """
+    Sync many repositories on a bounded worker pool.
+
+    Args:
+        specs (list): Repository specs from load_repo_list
+        jobs (int): Maximum repositories processed at once
+        **kwargs: Passed to sync_repo
+
+    Returns:
+        list: Per-repository results, in list order
+    """
+    if not specs:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(specs)))) as pool:
+        return list(pool.map(lambda spec: sync_repo(spec, **kwargs), specs))
+
+
+def format_table(results):
+    """
+    Render sync results as a fixed-width table.
+    """
+    width = max([len("repository")] + [len(r["name"]) for r in results])
+    lines = [f"{'repository':<{width}}  {'result':<12} {'exit':>4} {'time ms':>9}  detail"]
+    for r in results:
+        lines.append(f"{r['name']:<{width}}  {r['result']:<12} {r['exit_code']:>4} "
+                     f"{r['seconds'] * 1000:>9.1f}  {r['detail']}")
+    return "\n".join(lines)
+
+
+def _git_dirs(repo_path):
+    # Return (git dir, common dir) without running git, following the
+    # ".git" file of linked worktrees and submodules
+    dot_git = os.path.join(repo_path, ".git")
+    if os.path.isdir(dot_git):
+        return dot_git, dot_git
+    try:
+        with open(dot_git, encoding="utf-8") as f:
+            content = f.read().strip()
+    except OSError:
+        return None, None
+    if not content.startswith("gitdir:"):
+        return None, None
+    git_dir = os.path.normpath(os.path.join(repo_path, content[len("gitdir:"):].strip()))
+    try:
+        with open(os.path.join(git_dir, "commondir"), encoding="utf-8") as f:
+            return git_dir, os.path.normpath(os.path.join(git_dir, f.read().strip()))
+    except OSError:
+        return git_dir, git_dir
+
+
+def _ref_stamp(common_dir, ref):
+    # A loose ref changes its own file; a packed one changes packed-refs
+    for path in (os.path.join(common_dir, ref), os.path.join(common_dir, "packed-refs")):
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            continue
+    return None
+
+
+def status_key(repo_path, upstream=None):
+    """
+    Fingerprint the state `git status` depends on, using only stat() calls.
+
+    The key covers the index (mtime and size), HEAD, the branch ref HEAD
+    points to, the upstream's remote-tracking ref when known, the working
+    tree's top directory and every file directly inside it, so a commit,
+    checkout, stage, fetch or a file created, deleted or edited at the top
+    level all change it. Edits deeper in the tree only show once the
+    cached result expires.
+
+    Args:
+        repo_path (str): Working tree
+        upstream (str): Upstream branch, e.g. "origin/main"
+
+    Returns:
+        dict: JSON-serialisable key, or None if repo_path is not a repository
+    """
+    git_dir, common_dir = _git_dirs(repo_path)
+    if git_dir is None:
+        return None
+    try:
+        with open(os.path.join(git_dir, "HEAD"), encoding="utf-8") as f:
+            head = f.read().strip()
+    except OSError:
+        return None
+    try:
+        index = os.stat(os.path.join(git_dir, "index"))
+        key = {"index": [index.st_mtime_ns, index.st_size], "head": head}
+    except OSError:
+        key = {"index": None, "head": head}
+    if head.startswith("ref: "):
+        key["ref"] = _ref_stamp(common_dir, head[len("ref: "):])
+    if upstream:
+        key["upstream"] = _ref_stamp(common_dir, "refs/remotes/" + upstream)
+    key["worktree"] = os.stat(repo_path).st_mtime_ns
+    try:
+        with os.scandir(repo_path) as entries:
+            key["files"] = sorted(
+                [entry.name, stat.st_mtime_ns, stat.st_size]
+                for entry in entries if entry.is_file(follow_symlinks=False)
+                for stat in [entry.stat(follow_symlinks=False)]
+            )
+    except OSError:
+        return None
+    return key
+
+
+def scan_repo(spec, cached=None, max_age=STATUS_MAX_AGE, timeout=GIT_TIMEOUT):
+    """
+    Report one repository's status, reusing a cached result when valid.
+
+    A cached entry is reused when it is younger than max_age and the
+    repository's status_key is unchanged. Otherwise `git status
+    --porcelain=v2 --branch` runs with the untracked cache enabled, so
+    git only rescans directories whose mtime changed.
+
+    Args:
+        spec (dict): Repository spec from load_repo_list
+        cached (dict): Previous cache entry for the repository, or None
+        max_age (float): Seconds a cached result stays usable
+        timeout (float): Seconds allowed for git status
+
+    Returns:
+        tuple: (result dict, cache entry or None)
+    """
+    started = time.monotonic()
+    result = {"name": spec["name"], "path": spec["path"], "state": "missing",
+              "cached": False, "age": 0.0, "seconds": 0.0, "detail": ""}
+
+    def finish(entry=None):
+        result["seconds"] = time.monotonic() - started
+        return result, entry
+
+    if not os.path.isdir(spec["path"]):
+        result["detail"] = "directory not found"
+        return finish()
+    age = time.time() - cached["checked"] if cached else None
+    if cached and age < max_age:
+        key = status_key(spec["path"], cached["status"].get("upstream"))
+        if key is not None and key == cached["key"]:
+            result.update(cached["status"], cached=True, age=age)
+            return finish(cached)
+
+    code, out, err = _git(spec["path"], "-c", "core.untrackedCache=true", "status",
+                          "--porcelain=v2", "--branch", timeout=timeout)
+    if code:
+        lines = err.strip().splitlines()
+        result.update(state="error", detail=lines[-1] if lines else f"git exited {code}")
+        return finish()
+    status = parse_status(out)
+    status["state"] = "dirty" if status["changed"] + status["untracked"] else "clean"
+    result.update(status)
+    # Keyed after the scan, since git status may rewrite the index itself
+    key = status_key(spec["path"], status["upstream"])
+    return finish({"key": key, "checked": time.time(), "status": status} if key else None)
+
+
+def _load_status_cache(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_status_cache(path, cache):
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".fleet-status-")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(cache, f)
+    os.replace(tmp, path)
+
+
+def scan_fleet(specs, jobs=16, cache_path=STATUS_CACHE, max_age=STATUS_MAX_AGE,
+               timeout=GIT_TIMEOUT):
+    """
+    Scan many repositories' status concurrently.
+
+    Args:
+        specs (list): Repository specs from load_repo_list
+        jobs (int): Maximum git processes at once
+        cache_path (str): JSON status cache, or None to always run git
+        max_age (float): Seconds a cached result stays usable
+        timeout (float): Seconds allowed per git status
+
+    Returns:
+        list: Per-repository results, in list order
+    """
+    if not specs:
+        return []
+    cache = _load_status_cache(cache_path) if cache_path else {}
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(specs)))) as pool:
+        scanned = list(pool.map(
+            lambda spec: scan_repo(spec, cache.get(spec["path"]), max_age, timeout), specs))
+    if cache_path:
+        updated = dict(cache)
+        for spec, (_, entry) in zip(specs, scanned):
+            if entry is None:
+                updated.pop(spec["path"], None)
+            else:
+                updated[spec["path"]] = entry
+        if updated != cache:
+            _save_status_cache(cache_path, updated)
+    return [result for result, _ in scanned]
+
+
+def format_status_table(results):
+    """
+    Render fleet status results as a fixed-width table.
+    """
+    width = max([len("repository")] + [len(r["name"]) for r in results])
+    lines = [f"{'repository':<{width}}  {'state':<8} {'branch':<16} {'changed':>7} "
+             f"{'untracked':>9} {'ahead':>5} {'behind':>6} {'time ms':>8}  detail"]
+    for r in results:
+        if r["state"] in ("missing", "error"):
+            lines.append(f"{r['name']:<{width}}  {r['state']:<8} {'':<16} {'':>7} {'':>9} "
+                         f"{'':>5} {'':>6} {r['seconds'] * 1000:>8.1f}  {r['detail']}")
+            continue
+        note = f"cached {r['age']:.0f}s ago" if r["cached"] else ""
+        lines.append(f"{r['name']:<{width}}  {r['state']:<8} {r['branch'] or '(detached)':<16} "
+                     f"{r['changed']:>7} {r['untracked']:>9} {r['ahead']:>5} {r['behind']:>6} "
+                     f"{r['seconds'] * 1000:>8.1f}  {note}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Commit and push many repositories in parallel")
+    parser.add_argument("repo_list", nargs="?", default="repo_list.txt",
+                        help="repository list file (default repo_list.txt)")
+    parser.add_argument("-j", "--jobs", type=int, default=8, help="repositories processed at once")
+    parser.add_argument("-m", "--message", default=DEFAULT_MESSAGE,
+                        help="commit message template; {date} and {name} are filled in")
+    parser.add_argument("--no-push", action="store_true", help="commit but do not push")
+    parser.add_argument("--dry-run", action="store_true", help="only report each repository's status")
+    parser.add_argument("--timeout", type=float, default=GIT_TIMEOUT,
+                        help="seconds allowed per git command")
+    parser.add_argument("--status", action="store_true",
+                        help="scan and print every repository's status instead of syncing")
+    parser.add_argument("--max-age", type=float, default=STATUS_MAX_AGE,
+                        help="seconds a cached status stays usable")
+    parser.add_argument("--status-cache", default=STATUS_CACHE, help="status cache file")
+    parser.add_argument("--no-cache", action="store_true", help="always run git status")
+    args = parser.parse_args(argv)
+
+    specs = load_repo_list(args.repo_list)
+    started = time.monotonic()
+    if args.status:
+        results = scan_fleet(specs, jobs=args.jobs,
+                             cache_path=None if args.no_cache else args.status_cache,
+                             max_age=args.max_age, timeout=args.timeout)
+        print(format_status_table(results))
+        cached = sum(r["cached"] for r in results)
+        print(f"{len(results)} repositories in {(time.monotonic() - started) * 1000:.1f} ms, "
+              f"{cached} from cache")
+        return 0
+    results = sync_repos(specs, jobs=args.jobs, message=args.message, push=not args.no_push,
+                         dry_run=args.dry_run, timeout=args.timeout)
+    print(format_table(results))
+    failed = [r for r in results if r["exit_code"]]
+    print(f"{len(results)} repositories in {time.monotonic() - started:.2f}s, "
+          f"{len(failed)} failed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""
+Shared pooled HTTP transport for the Poly-AI Framework
+"""
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class Transport:
+    """
+    Pooled keep-alive HTTP transport shared by every API client.
+
+    Wraps one requests.Session whose adapters keep a bounded pool of
+    persistent connections per host, retry transient failures with
+    exponential back-off and apply connect/read timeouts to every call.
+    Rate-limit responses (403/429) are left to the caller's scheduler.
+    Callers with their own retry policy pass retry=False to send each
+    attempt exactly once, over a second pool that never retries.
+    """
+
+    def __init__(self, pool_connections=10, pool_maxsize=10, connect_timeout=3.05,
+                 read_timeout=30, retries=3, backoff_factor=0.5):
+        """
+        Args:
+            pool_connections (int): Number of per-host pools to keep
+            pool_maxsize (int): Maximum connections kept alive per host
+            connect_timeout (float): Seconds to wait for a connection
+            read_timeout (float): Seconds to wait between response bytes
+            retries (int): Retries for connection errors and 5xx responses
+            backoff_factor (float): Exponential back-off base in seconds
+        """
+        self.timeout = (connect_timeout, read_timeout)
+        self.retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=frozenset({"GET", "HEAD", "POST"}),
+            raise_on_status=False,
+        )
+        self.adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=self.retry,
+        )
+        self.single_adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=Retry(total=0, read=False, raise_on_status=False),
+        )
+        self.session = self._session(self.adapter)
+        self.single_session = self._session(self.single_adapter)
+        self._lock = threading.Lock()
+        self.requests = 0
+
+    @staticmethod
+    def _session(adapter):
+        session = requests.Session()
+        session.headers["Accept-Encoding"] = "gzip, deflate"
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def request(self, method, url, retry=True, **kwargs):
+        """
+        Send a request over the pooled session.
+
+        Args:
+            method (str): HTTP method
+            url (str): Request URL
+            retry (bool): Retry connection errors and 5xx responses; pass
+                False when the caller retries itself, e.g. resilient_call
+            **kwargs: Passed through to requests.Session.request
+
+        Returns:
+            requests.Response: The response
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        with self._lock:
+            self.requests += 1
+        session = self.session if retry else self.single_session
+        return session.request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def stats(self):
+        """
+        Return connection-reuse statistics.
+
+        Returns:
+            dict: Requests sent, connections opened and the share of
+            requests that reused a kept-alive connection
+        """
+        opened = 0
+        for adapter in (self.adapter, self.single_adapter):
+            pools = adapter.poolmanager.pools
+            opened += sum(pools[key].num_connections for key in list(pools.keys()))
+        with self._lock:
+            sent = self.requests
+        return {
+            "requests": sent,
+            "connections": opened,
+            "reuse_ratio": (sent - opened) / sent if sent else 0.0,
+        }
+
+    def close(self):
+        self.session.close()
+        self.single_session.close()
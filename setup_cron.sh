@@ -2,6 +2,19 @@
 # setup_cron.sh
 
 # This script sets up a cron job for weekly GitHub updates
+#
+# Pass --daemon to instead start the long-running poly_framework daemon at
+# boot; it refreshes rankings hourly and runs weekly_update.sh on the same
+# Sunday 10:00 AM schedule, keeping its caches and connections warm.
+
+if [ "$1" == "--daemon" ]; then
+    (crontab -l 2>/dev/null; echo "@reboot cd /home/johnycash/ai-tools/githubupdater && python3 poly_framework.py daemon --update '0 10 * * 0' >> poly_daemon.log 2>&1") | crontab -
+
+    echo "Cron job set up successfully!"
+    echo "The poly_framework daemon will start at boot and run the weekly update every Sunday at 10:00 AM"
+    echo "Check on it with: python3 poly_framework.py ctl status (socket ~/.cache/poly_framework/daemon.sock)"
+    exit 0
+fi
 
 # Create a cron job that runs every Sunday at 10:00 AM
 (crontab -l 2>/dev/null; echo "0 10 * * 0 /home/johnycash/ai-tools/githubupdater/weekly_update.sh") | crontab -
@@ -10,4 +23,4 @@ echo "Cron job set up successfully!"
 echo "The weekly update script will run every Sunday at 10:00 AM"
 
 # To view your current cron jobs, run: crontab -l
-# To remove all cron jobs, run: crontab -r
\ No newline at end of file
+# To remove all cron jobs, run: crontab -r
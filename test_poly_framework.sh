@@ -26,5 +26,53 @@ export OPEN_SOURCE=true
 python poly_framework.py
 unset OPEN_SOURCE
 
+echo ""
+
+# Benchmark the fetch path against the offline GitHub stand-in
+echo "=== Offline Fetch Benchmark ==="
+python bench_fetch.py --iterations 10
+
+echo ""
+
+# Run the daemon's refresh job twice against a fresh, empty tool store
+echo "=== Daemon Refresh With Store ==="
+STORE_DIR=$(mktemp -d)
+python - "$STORE_DIR/tools.db" <<'EOF' || exit 1
+import sys
+
+import poly_framework
+from poly_fakegithub import FakeGitHub, synthetic_repositories
+from poly_ranking import RankingIndex
+from poly_store import ToolStore
+
+with FakeGitHub(synthetic_repositories(50)) as server:
+    poly_framework.GITHUB_API = server.url
+    store = ToolStore(sys.argv[1])
+    index = RankingIndex(poly_framework.RANKING_WEIGHTS)
+    for attempt in range(2):
+        changed = poly_framework.refresh_ranking_index(index, "automation", store)
+        print(f"refresh {attempt + 1}: {changed} changed, {len(index)} indexed, {len(store)} stored")
+    assert len(index) == len(store) > 0
+EOF
+rm -rf "$STORE_DIR"
+
+echo ""
+
+# Sync a small fleet against local bare remotes
+echo "=== Parallel Repository Sync ==="
+SYNC_DIR=$(mktemp -d)
+for name in alpha beta gamma; do
+    git init -q --bare "$SYNC_DIR/remotes/$name.git"
+    git init -q -b main "$SYNC_DIR/work/$name"
+    git -C "$SYNC_DIR/work/$name" remote add origin "$SYNC_DIR/remotes/$name.git"
+    echo "$name" > "$SYNC_DIR/work/$name/README.md"
+    echo "work/$name" >> "$SYNC_DIR/repo_list.txt"
+done
+GIT_AUTHOR_NAME=test GIT_AUTHOR_EMAIL=test@example.com \
+GIT_COMMITTER_NAME=test GIT_COMMITTER_EMAIL=test@example.com \
+    python poly_sync.py "$SYNC_DIR/repo_list.txt" --jobs 3 || exit 1
+git -C "$SYNC_DIR/remotes/gamma.git" log --oneline main || exit 1
+rm -rf "$SYNC_DIR"
+
 echo ""
 echo "All tests completed successfully!"
\ No newline at end of file
@@ -9,6 +9,16 @@ DATE=$(date +"%Y-%m-%d")
 
 echo "Starting weekly GitHub update for $DATE"
 
+# With a repository list, sync every listed repository in parallel instead
+# of the two hard-coded projects below
+REPO_LIST="/home/johnycash/ai-tools/githubupdater/repo_list.txt"
+if [ -f "$REPO_LIST" ]; then
+    python3 /home/johnycash/ai-tools/githubupdater/poly_sync.py "$REPO_LIST"
+    STATUS=$?
+    echo "Weekly update process completed!"
+    exit $STATUS
+fi
+
 # Navigate to the sentiment analysis project directory
 cd /home/johnycash/ai-tools/githubupdater/sentiment-analysis-project
 